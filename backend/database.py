@@ -1,14 +1,30 @@
-"""Database connection module for MongoDB"""
+"""Database connection module for MongoDB
+
+``db`` is the content repository the routers use (see ``repository.py``):
+the Motor database by default, or an in-memory repository with
+``REPOSITORY_BACKEND=memory`` for benchmarks without a running mongod.
+"""
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 
+from repository import InMemoryRepository
+from utils.query_metrics import query_metrics
+
+REPOSITORY_BACKEND = os.environ.get('REPOSITORY_BACKEND', 'mongo')
+
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 db_name = os.environ.get('DB_NAME', 'test_database')
 
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
+if REPOSITORY_BACKEND == 'memory':
+    client = None
+    db = InMemoryRepository()
+else:
+    # tz_aware: dates are stored in UTC and read back as aware datetimes
+    client = AsyncIOMotorClient(mongo_url, tz_aware=True, event_listeners=[query_metrics])
+    db = client[db_name]
 
 async def close_db_connection():
     """Close the database connection"""
-    client.close()
+    if client is not None:
+        client.close()
@@ -0,0 +1,166 @@
+"""Declarative MongoDB index registry
+
+``INDEXES`` lists every index the routers rely on and is applied at
+startup. ``QUERY_SHAPES`` lists the filtered or sorted queries the routes
+issue; check mode runs ``explain`` on each and fails when one would scan
+the whole collection; it is enabled with ``INDEX_CHECK=1`` and makes
+startup fail, naming the offending routes.
+
+Reads of a whole collection without filter or sort (exports, small
+settings lists) are not listed: they scan by design.
+"""
+import logging
+import os
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from database import REPOSITORY_BACKEND, db
+from queries import (
+    active_session_filter, ending_news_filter, expired_trash_filter, not_deleted_filter,
+    other_sessions_filter, upcoming_news_filter, visible_news_filter,
+)
+from utils.auth import SESSION_LIFETIME
+from utils.pagination import keyset_filter
+
+logger = logging.getLogger(__name__)
+
+INDEX_CHECK = os.environ.get('INDEX_CHECK', '0') not in ('0', 'false', 'False')
+
+# ============== Index Registry ==============
+
+INDEXES = {
+    "pages": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("slug", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("order", ASCENDING)]),
+        IndexModel([("order", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("deleted_at", ASCENDING)]),
+    ],
+    "blog_posts": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", ASCENDING)]),
+        IndexModel([("publish_date", DESCENDING), ("id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("deleted_at", ASCENDING)]),
+    ],
+    "contact_submissions": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("timestamp", DESCENDING), ("id", ASCENDING)]),
+        IndexModel([("timestamp", DESCENDING), ("id", ASCENDING)]),
+    ],
+    "gallery_images": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("order", ASCENDING), ("id", ASCENDING)]),
+    ],
+    "news": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("order", ASCENDING)]),
+        # Next scheduled start/end of a live item
+        IndexModel([("status", ASCENDING), ("start_date", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("end_date", ASCENDING)]),
+        IndexModel([("order", ASCENDING)]),
+    ],
+    "static_pages": [
+        IndexModel([("page_id", ASCENDING)]),
+    ],
+    "page_content": [IndexModel([("type", ASCENDING)])],
+    "landing_content": [IndexModel([("type", ASCENDING)])],
+    "site_settings": [IndexModel([("type", ASCENDING)])],
+    "admin_settings": [IndexModel([("type", ASCENDING)])],
+    "admin_sessions": [
+        IndexModel([("token", ASCENDING)], unique=True),
+        # Logging out every other session
+        IndexModel([("active", ASCENDING)]),
+        # MongoDB deletes sessions once they are past their lifetime
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=int(SESSION_LIFETIME.total_seconds())),
+    ],
+    "admin_revoked_tokens": [
+        IndexModel([("token_id", ASCENDING)]),
+        IndexModel([("issued_ms", ASCENDING)]),
+    ],
+}
+
+# Sample date for cursors, time windows and cutoffs
+DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def _after_cursor(query: dict, sort: list, values: list) -> dict:
+    """Filter of a follow-up page (``utils.pagination``)"""
+    return {"$and": [query, keyset_filter(sort, values)]}
+
+# (route, collection, filter, sort)
+QUERY_SHAPES = [
+    ("GET /api/pages", "pages", {"status": "live"}, [("order", 1)]),
+    ("GET /api/pages/{slug}", "pages", {"slug": "x", "status": "live"}, None),
+    ("GET /api/admin/pages", "pages", not_deleted_filter(), [("order", 1), ("id", 1)]),
+    ("GET /api/admin/pages?cursor", "pages", _after_cursor(not_deleted_filter(), [("order", 1), ("id", 1)], [1, "x"]), [("order", 1), ("id", 1)]),
+    ("GET /api/admin/pages/trash", "pages", {"status": "deleted"}, None),
+    ("PUT /api/admin/pages/{id}", "pages", {"id": "x"}, None),
+    ("POST /api/admin/trash/cleanup", "pages", expired_trash_filter(DATE), None),
+    ("GET /api/blog", "blog_posts", {"status": "live"}, [("created_at", -1), ("id", 1)]),
+    ("GET /api/blog?cursor", "blog_posts", _after_cursor({"status": "live"}, [("created_at", -1), ("id", 1)], [DATE, "x"]), [("created_at", -1), ("id", 1)]),
+    ("GET /api/blog/{id}", "blog_posts", {"id": "x", "status": "live"}, None),
+    ("GET /api/admin/posts", "blog_posts", not_deleted_filter(), [("publish_date", -1), ("id", 1)]),
+    ("GET /api/admin/posts?cursor", "blog_posts", _after_cursor(not_deleted_filter(), [("publish_date", -1), ("id", 1)], [DATE, "x"]), [("publish_date", -1), ("id", 1)]),
+    ("GET /api/admin/posts/trash", "blog_posts", {"status": "deleted"}, None),
+    ("POST /api/admin/trash/cleanup", "blog_posts", expired_trash_filter(DATE), None),
+    ("GET /api/admin/contacts", "contact_submissions", {}, [("timestamp", -1), ("id", 1)]),
+    ("GET /api/admin/contacts?cursor", "contact_submissions", _after_cursor({}, [("timestamp", -1), ("id", 1)], [DATE, "x"]), [("timestamp", -1), ("id", 1)]),
+    ("GET /api/admin/contacts?status", "contact_submissions", {"status": "neu"}, [("timestamp", -1), ("id", 1)]),
+    ("PUT /api/admin/contacts/{id}/status", "contact_submissions", {"id": "x"}, None),
+    ("GET /api/gallery", "gallery_images", {}, [("order", 1), ("id", 1)]),
+    ("GET /api/gallery?cursor", "gallery_images", _after_cursor({}, [("order", 1), ("id", 1)], [1, "x"]), [("order", 1), ("id", 1)]),
+    ("PUT /api/admin/gallery/{id}", "gallery_images", {"id": "x"}, None),
+    ("GET /api/news", "news", visible_news_filter(DATE), [("order", 1)]),
+    ("GET /api/news (next start)", "news", upcoming_news_filter(DATE), [("start_date", 1)]),
+    ("GET /api/news (next end)", "news", ending_news_filter(DATE), [("end_date", 1)]),
+    ("GET /api/admin/news", "news", {}, [("order", 1)]),
+    ("PUT /api/admin/news/{id}", "news", {"id": "x"}, None),
+    ("GET /api/static-pages/{id}", "static_pages", {"page_id": "x"}, None),
+    ("GET /api/page-content/*", "page_content", {"type": "impressum"}, None),
+    ("GET /api/landing-content", "landing_content", {"type": "main"}, None),
+    ("GET /api/settings", "site_settings", {"type": "main"}, None),
+    ("POST /api/admin/login", "admin_settings", {"type": "admin"}, None),
+    ("verify_admin_session", "admin_sessions", active_session_filter("x"), None),
+    ("end_other_admin_sessions", "admin_sessions", other_sessions_filter("x"), None),
+]
+
+async def apply_indexes():
+    """Create every registered index (a no-op for existing ones)"""
+    for collection, models in INDEXES.items():
+        await db[collection].create_indexes(models)
+
+# ============== Check Mode ==============
+
+def _stages(plan: dict):
+    """All stage names of an explain plan tree"""
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+async def check_indexes() -> list:
+    """Return the query shapes whose winning plan is a collection scan"""
+    failures = []
+    for route, collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        plan = explain["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in set(_stages(plan)):
+            failures.append(f"{route}: {collection}.find({query}) sort={sort}")
+    return failures
+
+async def ensure_indexes():
+    """Apply the registry; in check mode fail when a route still scans"""
+    await apply_indexes()
+    if INDEX_CHECK and REPOSITORY_BACKEND != 'mongo':
+        logger.info("Index check skipped: no query planner in the %s repository", REPOSITORY_BACKEND)
+    elif INDEX_CHECK:
+        failures = await check_indexes()
+        if failures:
+            raise RuntimeError("Queries without index:\n" + "\n".join(failures))
+        logger.info("Index check passed for %d query shapes", len(QUERY_SHAPES))
+
@@ -3,7 +3,9 @@
 This is the main FastAPI application file for the gltz.de family website.
 For deployment on Railway or similar platforms.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
@@ -16,17 +18,56 @@ load_dotenv(ROOT_DIR / '.env')
 
 # Import database connection
 from database import close_db_connection
+from migrations import run_migrations
+from indexes import ensure_indexes
+from utils.auth import SESSION_MODE, load_signed_sessions
+from utils.circuit_breaker import DB_BREAKER_RESET_SECONDS, DatabaseUnavailable
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.query_metrics import current_route
+from utils.search_index import search_index
+from publish import SNAPSHOT_DIR, publisher
 
 # Import all route modules
-from routes import admin, pages, blog, gallery, news, contacts, static_pages, landing, search
+from routes import admin, pages, blog, gallery, news, contacts, static_pages, landing, search, home
+
+# Application lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and in-memory state on startup, close on shutdown"""
+    await run_migrations()
+    await ensure_indexes()
+    if SESSION_MODE == 'signed':
+        await load_signed_sessions()
+    await search_index.build()
+    if SNAPSHOT_DIR:
+        publisher.start(app)
+        await publisher.publish()
+    yield
+    await close_db_connection()
+
+async def tag_route(request: Request):
+    """Attribute the database commands of this request to its route"""
+    route = request.scope.get("route")
+    current_route.set(f"{request.method} {route.path if route else request.url.path}")
 
 # Create FastAPI application
 app = FastAPI(
     title="gltz.de API",
     description="Backend API for the gltz.de family website",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    dependencies=[Depends(tag_route)]
 )
 
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable(request: Request, exc: DatabaseUnavailable):
+    """Public reads without a cached copy while the database is down"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Datenbank vorübergehend nicht erreichbar"},
+        headers={"Retry-After": str(int(DB_BREAKER_RESET_SECONDS))},
+    )
+
 # Include all routers
 app.include_router(admin.router)
 app.include_router(pages.router)
@@ -37,6 +78,7 @@ app.include_router(contacts.router)
 app.include_router(static_pages.router)
 app.include_router(landing.router)
 app.include_router(search.router)
+app.include_router(home.router)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -45,17 +87,12 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown"""
-    await close_db_connection()
-
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,163 @@
+"""Versioned startup migrations
+
+Each migration runs once per database: after it succeeds a marker document
+``{"_id": name, "version": n}`` is written to the ``migrations``
+collection, and later startups skip it. Applied versions are also cached
+in-process, so checking them on a request costs no database round-trip.
+"""
+from datetime import datetime, timezone
+import logging
+import uuid
+
+from pymongo import UpdateOne
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# name -> version applied in this database (filled by run_migrations)
+applied_migrations = {}
+
+# ============== Migrations ==============
+
+async def seed_demo_content():
+    """Seed default blog posts, gallery images and pages into an empty database"""
+    existing_posts = await db.blog_posts.count_documents({})
+    if existing_posts == 0:
+        default_posts = [
+            {
+                "id": str(uuid.uuid4()),
+                "title": "Schlaf-Routinen für Zwillinge",
+                "excerpt": "Wie wir unsere Zwillinge gleichzeitig zum Schlafen bringen.",
+                "content": "Der Schlaf ist eine der größten Herausforderungen...",
+                "category": "Schlaf",
+                "image_url": "https://images.unsplash.com/photo-1544367567-0f2fcb009e0b?w=400",
+                "status": "live",
+                "publish_date": datetime.now(timezone.utc),
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            },
+            {
+                "id": str(uuid.uuid4()),
+                "title": "Tandem-Stillen leicht gemacht",
+                "excerpt": "Praktische Positionen für das gleichzeitige Stillen.",
+                "content": "Das Tandem-Stillen war anfangs eine Herausforderung...",
+                "category": "Füttern",
+                "image_url": "https://images.unsplash.com/photo-1555252333-9f8e92e65df9?w=400",
+                "status": "live",
+                "publish_date": datetime.now(timezone.utc),
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            },
+            {
+                "id": str(uuid.uuid4()),
+                "title": "10 Hacks für den Zwillingsalltag",
+                "excerpt": "Von der Wickelstation bis zum Einkaufen.",
+                "content": "Nach einem Jahr mit Zwillingen haben wir viel gelernt...",
+                "category": "Tipps",
+                "image_url": "https://images.unsplash.com/photo-1503454537195-1dcabb73ffb9?w=400",
+                "status": "live",
+                "publish_date": datetime.now(timezone.utc),
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            }
+        ]
+        await db.blog_posts.insert_many(default_posts)
+    
+    existing_images = await db.gallery_images.count_documents({})
+    if existing_images == 0:
+        default_images = [
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1513542789411-b6a5d4f31634?w=600", "title": "Handabdrücke", "alt": "Bunte Kinderkunst - Handabdrücke", "tags": ["Baby-Art", "Handabdrücke"], "created_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1579783902614-a3fb3927b6a5?w=600", "title": "Abstrakt", "alt": "Abstrakte Kindermalerei", "tags": ["Abstrakt"], "created_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1561214115-f2f134cc4912?w=600", "title": "Familie", "alt": "Kreative Familienmotive", "tags": ["Familie"], "created_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1596464716127-f2a82984de30?w=600", "title": "Fingermalerei", "alt": "Fingermalerei von Kindern", "tags": ["Baby-Art"], "created_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1499892477393-f675706cbe6e?w=600", "title": "Farbkleckse", "alt": "Bunte Farbkleckse", "tags": ["Abstrakt"], "created_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "url": "https://images.unsplash.com/photo-1460661419201-fd4cecdf8a8b?w=600", "title": "Kleine Hände", "alt": "Kunstwerke von kleinen Händen", "tags": ["Baby-Art", "Familie"], "created_at": datetime.now(timezone.utc)},
+        ]
+        await db.gallery_images.insert_many(default_images)
+    
+    existing_pages = await db.pages.count_documents({})
+    if existing_pages == 0:
+        default_pages = [
+            {"id": str(uuid.uuid4()), "title": "Impressum", "slug": "impressum", "content": "Impressum Inhalt hier...", "status": "live", "order": 1, "created_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)},
+            {"id": str(uuid.uuid4()), "title": "Datenschutz", "slug": "datenschutz", "content": "Datenschutzerklärung hier...", "status": "live", "order": 2, "created_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)},
+        ]
+        await db.pages.insert_many(default_pages)
+
+# Timestamp fields stored as ISO strings before dates were written natively
+DATE_FIELDS = {
+    "pages": ("created_at", "updated_at", "deleted_at"),
+    "blog_posts": ("created_at", "updated_at", "publish_date", "deleted_at"),
+    "gallery_images": ("created_at",),
+    "news": ("created_at", "start_date", "end_date"),
+    "contact_submissions": ("timestamp",),
+    "static_pages": ("created_at", "updated_at"),
+    "landing_content": ("updated_at",),
+    "site_settings": ("updated_at",),
+    "page_content": ("updated_at",),
+    "migrations": ("applied_at",),
+}
+
+DATE_BATCH_SIZE = 500
+
+def _parse_date(value: str):
+    """ISO string -> aware datetime (naive values are UTC), None if unparseable"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+async def _convert_dates(collection: str, fields):
+    """Rewrite string timestamps of one collection as BSON dates, in batches"""
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    projection = {field: 1 for field in fields}
+    batch = []
+    async for doc in db[collection].find(query, projection):
+        updates = {}
+        for field in fields:
+            if isinstance(doc.get(field), str):
+                parsed = _parse_date(doc[field])
+                if parsed is not None:
+                    updates[field] = parsed
+        if not updates:
+            continue
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+        if len(batch) >= DATE_BATCH_SIZE:
+            await db[collection].bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await db[collection].bulk_write(batch, ordered=False)
+
+async def admin_session_dates():
+    """Store admin session ``created_at`` as BSON dates so the TTL index applies"""
+    await _convert_dates("admin_sessions", ("created_at",))
+
+async def bson_dates():
+    """Store every timestamp as a BSON date instead of an ISO string"""
+    for collection, fields in DATE_FIELDS.items():
+        await _convert_dates(collection, fields)
+
+# Ordered registry: (name, version, coroutine function). Bump the version to
+# re-run a migration whose logic changed.
+MIGRATIONS = [
+    ("seed_demo_content", 1, seed_demo_content),
+    ("admin_session_dates", 1, admin_session_dates),
+    ("bson_dates", 1, bson_dates),
+]
+
+async def run_migrations():
+    """Apply pending migrations and record their markers"""
+    markers = {m["_id"]: m.get("version", 0) async for m in db.migrations.find({})}
+    for name, version, migrate in MIGRATIONS:
+        if markers.get(name, 0) >= version:
+            applied_migrations[name] = markers[name]
+            continue
+        logger.info("Running migration %s (v%s)", name, version)
+        await migrate()
+        await db.migrations.update_one(
+            {"_id": name},
+            {"$set": {"version": version, "applied_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        applied_migrations[name] = version
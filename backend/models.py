@@ -237,6 +237,7 @@ class DashboardStats(BaseModel):
     total_gallery: int = 0
     total_posts: int = 0
     donations_count: int = 0
+    admin_sessions: int = 0
 
 # ============== Legal Text Models ==============
 
@@ -0,0 +1,248 @@
+"""Static JSON snapshots of the public API
+
+When ``SNAPSHOT_DIR`` is set, every public GET endpoint is rendered to a
+JSON file after each admin write (``content_versions.bump``, debounced by
+``SNAPSHOT_DELAY`` seconds), once at startup, and whenever a news item's
+start or end date passes (which changes ``/api/news`` and ``/api/home``
+without a write), so the frontend host can serve the content without
+reaching the backend.
+
+Layout::
+
+    SNAPSHOT_DIR/
+        manifest.json               current version, API path -> file
+        versions/<version>/settings.json
+        versions/<version>/blog.json, blog/<id>.json, ...
+
+File names mirror the API paths without ``/api/``. Paginated lists
+(``/api/blog``, ``/api/gallery``) are exported complete: the export
+follows ``X-Next-Cursor`` and joins the pages into one array. A version
+directory is
+written under a temporary name and renamed into place when complete; the
+manifest is replaced atomically afterwards, so readers never see a
+partial export. The newest ``SNAPSHOT_KEEP`` versions are kept.
+
+The bodies are produced by running the requests through the ASGI app, so
+they are byte-identical to what the routes serve (a single-page list
+included).
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from database import db
+from routes.news import load_public_news, seconds_until
+from routes.static_pages import STATIC_PAGE_DEFAULTS
+from utils.cache import content_versions, render_json
+from utils.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', '')
+SNAPSHOT_KEEP = int(os.environ.get('SNAPSHOT_KEEP', '3'))
+SNAPSHOT_DELAY = float(os.environ.get('SNAPSHOT_DELAY', '2'))
+
+# Paginated public lists, exported in full
+LIST_PATHS = ["/api/blog", "/api/gallery"]
+
+# Public endpoints without path parameters
+FIXED_PATHS = [
+    "/api/settings",
+    "/api/landing-content",
+    "/api/home",
+    "/api/news",
+    "/api/pages",
+    "/api/page-content/impressum",
+    "/api/page-content/datenschutz",
+    "/api/page-content/cookies",
+]
+
+async def _asgi_get(app, path: str, query: str = "") -> tuple:
+    """Run a GET request through the app; return (status, headers, body)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"snapshot")],
+        "client": ("127.0.0.1", 0),
+        "server": ("snapshot", 80),
+    }
+    status = 500
+    headers = {}
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers.update((k.decode().lower(), v.decode()) for k, v in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, headers, b"".join(chunks)
+
+async def _asgi_get_all(app, path: str) -> tuple:
+    """Every page of a cursor-paginated list as one array; return (status, body)"""
+    items = []
+    query = {"limit": MAX_PAGE_SIZE}
+    while True:
+        status, headers, body = await _asgi_get(app, path, urlencode(query))
+        if status != 200:
+            return status, body
+        items.extend(json.loads(body))
+        cursor = headers.get(NEXT_CURSOR_HEADER.lower())
+        if not cursor:
+            return status, render_json(items)
+        query["cursor"] = cursor
+
+async def _dynamic_paths() -> List[str]:
+    """Detail endpoints of every live post, page and static page"""
+    posts, pages, static_pages = await asyncio.gather(
+        db.blog_posts.find({"status": "live"}, {"_id": 0, "id": 1}).to_list(None),
+        db.pages.find({"status": "live"}, {"_id": 0, "slug": 1}).to_list(None),
+        db.static_pages.find({}, {"_id": 0, "page_id": 1}).to_list(None),
+    )
+    page_ids = dict.fromkeys(list(STATIC_PAGE_DEFAULTS) + [p["page_id"] for p in static_pages if p.get("page_id")])
+    return (
+        [f"/api/blog/{post['id']}" for post in posts]
+        + [f"/api/pages/{page['slug']}" for page in pages if page.get("slug")]
+        + [f"/api/static-pages/{page_id}" for page_id in page_ids]
+    )
+
+def _file_name(path: str) -> str:
+    return path[len("/api/"):] + ".json"
+
+class SnapshotPublisher:
+    """Renders the public API to versioned JSON files"""
+
+    def __init__(self, directory: str, keep: int = SNAPSHOT_KEEP, delay: float = SNAPSHOT_DELAY):
+        self.directory = directory
+        self.keep = keep
+        self.delay = delay
+        self.app = None
+        self.manifest: Optional[dict] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.app is not None
+
+    def start(self, app):
+        """Attach to the app and publish after every content write"""
+        self.app = app
+        content_versions.subscribe(self.schedule)
+
+    def schedule(self, scopes=()):
+        """Publish soon; writes arriving meanwhile share one export"""
+        if not self.enabled:
+            return
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _schedule_at(self, moment: Optional[datetime]):
+        """Publish again at ``moment`` (the next news start/end), replacing any earlier timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        delay = seconds_until(moment)
+        if delay is not None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self.schedule)
+
+    async def _run(self):
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            self._dirty = False
+            try:
+                await self.publish()
+            except Exception:
+                logger.exception("Snapshot export failed")
+
+    async def publish(self) -> dict:
+        """Export every public endpoint as a new version; return the manifest"""
+        async with self._lock:
+            started = time.perf_counter()
+            files: Dict[str, bytes] = {}
+            _, next_news_change = await load_public_news()
+            for path in LIST_PATHS:
+                status, body = await _asgi_get_all(self.app, path)
+                if status == 200:
+                    files[path] = body
+                else:
+                    logger.warning("Snapshot of %s skipped: status %d", path, status)
+            for path in FIXED_PATHS + await _dynamic_paths():
+                if ".." in path.split("/"):
+                    continue
+                status, _, body = await _asgi_get(self.app, path)
+                if status == 200:
+                    files[path] = body
+                else:
+                    logger.warning("Snapshot of %s skipped: status %d", path, status)
+
+            version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            manifest = {
+                "version": version,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "base": f"versions/{version}",
+                "content_versions": {scope: content_versions.get(scope) for scope in
+                                     ("settings", "landing", "news", "blog", "gallery", "pages", "static_pages", "legal")},
+                "files": {
+                    path: {
+                        "file": _file_name(path),
+                        "sha256": hashlib.sha256(body).hexdigest(),
+                        "bytes": len(body),
+                    }
+                    for path, body in files.items()
+                },
+            }
+            await asyncio.to_thread(self._write, version, files, manifest)
+            self.manifest = manifest
+            self._schedule_at(next_news_change)
+            logger.info("Published snapshot %s: %d files in %.0f ms",
+                        version, len(files), (time.perf_counter() - started) * 1000)
+            return manifest
+
+    def _write(self, version: str, files: Dict[str, bytes], manifest: dict):
+        versions = os.path.join(self.directory, "versions")
+        staging = os.path.join(versions, f".tmp-{version}")
+        os.makedirs(staging, exist_ok=True)
+        for path, body in files.items():
+            target = os.path.join(staging, _file_name(path))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(body)
+        os.rename(staging, os.path.join(versions, version))
+
+        manifest_tmp = os.path.join(self.directory, f".manifest-{version}.json")
+        with open(manifest_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(manifest_tmp, os.path.join(self.directory, "manifest.json"))
+
+        # Version names sort chronologically
+        published = sorted(name for name in os.listdir(versions) if not name.startswith("."))
+        for name in published[:-self.keep]:
+            shutil.rmtree(os.path.join(versions, name), ignore_errors=True)
+
+publisher = SnapshotPublisher(SNAPSHOT_DIR)
@@ -0,0 +1,45 @@
+"""MongoDB filters shared by the routes and the index registry
+
+``indexes.QUERY_SHAPES`` builds its sample queries with these helpers, so
+the index check explains the filters the routes actually send.
+"""
+from datetime import datetime
+
+# ============== Content ==============
+
+def not_deleted_filter() -> dict:
+    """Admin lists: everything outside the trash"""
+    return {"status": {"$ne": "deleted"}}
+
+def expired_trash_filter(cutoff: datetime) -> dict:
+    """Trashed documents deleted before ``cutoff``"""
+    return {"status": "deleted", "deleted_at": {"$lt": cutoff}}
+
+# ============== News ==============
+
+def visible_news_filter(now: datetime) -> dict:
+    """Live items whose start/end window contains ``now`` (missing = open)"""
+    return {
+        "status": "live",
+        "$and": [
+            {"$or": [{"start_date": None}, {"start_date": {"$lte": now}}]},
+            {"$or": [{"end_date": None}, {"end_date": {"$gte": now}}]},
+        ],
+    }
+
+def upcoming_news_filter(now: datetime) -> dict:
+    """Live items that start after ``now``"""
+    return {"status": "live", "start_date": {"$gt": now}}
+
+def ending_news_filter(now: datetime) -> dict:
+    """Live items that end at or after ``now``"""
+    return {"status": "live", "end_date": {"$gte": now}}
+
+# ============== Admin Sessions ==============
+
+def active_session_filter(token: str) -> dict:
+    return {"token": token, "active": True}
+
+def other_sessions_filter(token: str) -> dict:
+    """Active sessions except the one holding ``token``"""
+    return {"active": True, "token": {"$ne": token}}
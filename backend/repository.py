@@ -0,0 +1,377 @@
+"""Content repository backends
+
+The routers talk to a *content repository*: an object whose attributes (or
+items) are collections offering the Motor collection API subset used in
+this project - ``find(filter, projection)`` with ``sort``/``skip``/
+``limit``/``to_list``/``async for``, ``find_one``, ``insert_one``/
+``insert_many``, ``update_one``/``update_many`` (``$set``, ``$unset``,
+``$inc``, ``$setOnInsert``, upserts), ``delete_one``/``delete_many``,
+``count_documents``, ``bulk_write`` and the index calls.
+
+``database.py`` selects the backend with ``REPOSITORY_BACKEND``:
+
+- ``mongo`` (default): the Motor database itself.
+- ``memory``: ``InMemoryRepository`` below, with the same query
+  semantics, for benchmarks and load tests without a running mongod.
+  Data lives only as long as the process.
+"""
+import copy
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+MISSING = object()
+
+# BSON comparison order of the types stored here
+TYPE_ORDER = ((type(None), 0), (bool, 8), ((int, float), 1), (str, 2), (dict, 3), (list, 4), (ObjectId, 7), (datetime, 9))
+
+TYPE_ALIASES = {
+    "string": str, "date": datetime, "bool": bool, "object": dict, "array": list,
+    "objectId": ObjectId, "null": type(None), "int": int, "long": int, "double": float,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    """BSON dates are UTC with millisecond precision; naive values count as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _to_bson(value):
+    """Store values as MongoDB would (see ``_as_utc`` for datetimes)"""
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    if isinstance(value, dict):
+        return {k: _to_bson(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_bson(v) for v in value]
+    return value
+
+
+def _type_rank(value) -> int:
+    for types, rank in TYPE_ORDER:
+        if isinstance(value, types):
+            return rank
+    return 10
+
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return MISSING
+    return value
+
+
+def _set(doc: dict, path: str, value):
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[last] = value
+
+
+def _unset(doc: dict, path: str):
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(last, None)
+
+
+def _compare(value, operand, op) -> bool:
+    if value is MISSING or _type_rank(value) != _type_rank(operand):
+        return False
+    if isinstance(operand, datetime):
+        operand = _as_utc(operand)
+    try:
+        return op(value, operand)
+    except TypeError:
+        return False
+
+
+def _equals(value, operand) -> bool:
+    if value is MISSING:
+        return operand is None
+    if isinstance(operand, datetime):
+        operand = _as_utc(operand)
+    if isinstance(value, list) and not isinstance(operand, list):
+        return operand in value
+    return value == operand
+
+
+def _match_operators(value, spec: dict) -> bool:
+    for op, operand in spec.items():
+        if op == "$eq":
+            ok = _equals(value, operand)
+        elif op == "$ne":
+            ok = not _equals(value, operand)
+        elif op == "$gt":
+            ok = _compare(value, operand, lambda a, b: a > b)
+        elif op == "$gte":
+            ok = _compare(value, operand, lambda a, b: a >= b)
+        elif op == "$lt":
+            ok = _compare(value, operand, lambda a, b: a < b)
+        elif op == "$lte":
+            ok = _compare(value, operand, lambda a, b: a <= b)
+        elif op == "$in":
+            ok = any(_equals(value, item) for item in operand)
+        elif op == "$nin":
+            ok = not any(_equals(value, item) for item in operand)
+        elif op == "$exists":
+            ok = (value is not MISSING) == bool(operand)
+        elif op == "$type":
+            ok = value is not MISSING and isinstance(value, TYPE_ALIASES[operand])
+        elif op == "$regex":
+            flags = re.IGNORECASE if "i" in spec.get("$options", "") else 0
+            ok = isinstance(value, str) and re.search(operand, value, flags) is not None
+        elif op == "$options":
+            ok = True
+        elif op == "$not":
+            ok = not _match_operators(value, operand)
+        else:
+            raise ValueError(f"Unsupported query operator {op}")
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc: dict, query: Optional[dict]) -> bool:
+    """Whether a document matches a MongoDB filter"""
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and condition and next(iter(condition)).startswith("$"):
+            if not _match_operators(_get(doc, key), condition):
+                return False
+        elif not _equals(_get(doc, key), condition):
+            return False
+    return True
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return copy.deepcopy(doc)
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        result = {k: copy.deepcopy(v) for k, v in doc.items() if k in include}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    return {k: copy.deepcopy(v) for k, v in doc.items() if projection.get(k, 1)}
+
+
+def _sort_key(path: str):
+    def key(doc):
+        value = _get(doc, path)
+        if value is MISSING:
+            value = None
+        return (_type_rank(value), value if value is not None else 0)
+    return key
+
+
+def _sort_spec(key_or_list, direction=None) -> List[tuple]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return list(key_or_list)
+
+
+class InMemoryCursor:
+    """Lazy result set supporting the Motor cursor calls used by the routes"""
+
+    def __init__(self, docs: List[dict], projection: Optional[dict]):
+        self._docs = docs
+        self._projection = projection
+        self._sort: List[tuple] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _results(self) -> List[dict]:
+        docs = list(self._docs)
+        for path, direction in reversed(self._sort):
+            docs.sort(key=_sort_key(path), reverse=direction == -1)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        results = self._results()
+        return results[:length] if length else results
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._results():
+            yield doc
+
+    async def explain(self) -> dict:
+        return {"queryPlanner": {"winningPlan": {"stage": "IN_MEMORY"}}}
+
+
+class InMemoryCollection:
+    """A list of documents with MongoDB query and update semantics"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: List[dict] = []
+        self._indexes: Dict[str, dict] = {"_id_": {"key": [("_id", 1)]}}
+
+    def _matching(self, query: Optional[dict]) -> List[dict]:
+        return [doc for doc in self._docs if matches(doc, query)]
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, sort=None, limit: int = 0):
+        cursor = InMemoryCursor(self._matching(filter), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None):
+        for doc in self._docs:
+            if matches(doc, filter):
+                return _project(doc, projection)
+        return None
+
+    async def count_documents(self, filter: dict) -> int:
+        return len(self._matching(filter))
+
+    async def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    def _insert(self, document: dict) -> Any:
+        document.setdefault("_id", ObjectId())
+        self._docs.append(_to_bson(copy.deepcopy(document)))
+        return document["_id"]
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True) -> InsertManyResult:
+        return InsertManyResult([self._insert(doc) for doc in documents], True)
+
+    @staticmethod
+    def _apply(doc: dict, update: dict, inserting: bool = False):
+        if not any(key.startswith("$") for key in update):
+            keep_id = doc.get("_id")
+            doc.clear()
+            doc.update(_to_bson(copy.deepcopy(update)))
+            if keep_id is not None:
+                doc["_id"] = keep_id
+            return
+        for op, fields in update.items():
+            for path, value in fields.items():
+                if op == "$set" or (op == "$setOnInsert" and inserting):
+                    _set(doc, path, _to_bson(copy.deepcopy(value)))
+                elif op == "$unset":
+                    _unset(doc, path)
+                elif op == "$inc":
+                    current = _get(doc, path)
+                    _set(doc, path, (0 if current is MISSING else current) + value)
+                elif op != "$setOnInsert":
+                    raise ValueError(f"Unsupported update operator {op}")
+
+    def _update(self, filter: dict, update: dict, upsert: bool, many: bool) -> UpdateResult:
+        targets = self._matching(filter)
+        if not many:
+            targets = targets[:1]
+        for doc in targets:
+            self._apply(doc, update)
+        raw = {"n": len(targets), "nModified": len(targets)}
+        if not targets and upsert:
+            doc = {k: v for k, v in filter.items()
+                   if not k.startswith("$") and not (isinstance(v, dict) and any(op.startswith("$") for op in v))}
+            self._apply(doc, update, inserting=True)
+            raw = {"n": 1, "nModified": 0, "upserted": self._insert(doc)}
+        return UpdateResult(raw, True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        return self._update(filter, update, upsert, many=False)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        return self._update(filter, update, upsert, many=True)
+
+    def _delete(self, filter: dict, many: bool) -> DeleteResult:
+        targets = self._matching(filter)
+        if not many:
+            targets = targets[:1]
+        drop = {id(doc) for doc in targets}
+        self._docs = [doc for doc in self._docs if id(doc) not in drop]
+        return DeleteResult({"n": len(targets)}, True)
+
+    async def delete_one(self, filter: dict) -> DeleteResult:
+        return self._delete(filter, many=False)
+
+    async def delete_many(self, filter: dict) -> DeleteResult:
+        return self._delete(filter, many=True)
+
+    async def bulk_write(self, requests: List[UpdateOne], ordered: bool = True) -> BulkWriteResult:
+        matched = 0
+        for request in requests:
+            spec = request._doc
+            result = self._update(request._filter, spec, request._upsert or False, many=False)
+            matched += result.matched_count
+        return BulkWriteResult({"nMatched": matched, "nModified": matched}, True)
+
+    async def create_index(self, keys, **options) -> str:
+        keys = _sort_spec(keys, 1)
+        name = options.get("name") or "_".join(f"{k}_{d}" for k, d in keys)
+        self._indexes[name] = {"key": keys, **options}
+        return name
+
+    async def create_indexes(self, models) -> List[str]:
+        names = []
+        for model in models:
+            spec = dict(model.document)
+            keys = list(spec.pop("key").items())
+            names.append(await self.create_index(keys, **spec))
+        return names
+
+    async def index_information(self) -> Dict[str, dict]:
+        return copy.deepcopy(self._indexes)
+
+
+class InMemoryRepository:
+    """Content repository keeping every collection in process memory"""
+
+    def __init__(self):
+        self._collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = InMemoryCollection(name)
+        return collection
+
+    def __getattr__(self, name: str) -> InMemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
@@ -1,5 +1,5 @@
 """Admin routes - authentication, dashboard, settings"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime, timezone, timedelta
 import uuid
 
@@ -10,8 +10,14 @@ from models import (
 )
 from utils.auth import (
     hash_password, verify_admin_session, create_admin_session,
-    DEFAULT_PASSWORD
+    end_admin_session, end_other_admin_sessions, DEFAULT_PASSWORD
 )
+from utils.cache import content_versions, json_body_response, response_cache
+from utils.http_cache import content_etag, not_modified, set_cache_headers
+from utils.circuit_breaker import db_breaker
+from utils.query_metrics import query_metrics
+from publish import publisher
+from queries import expired_trash_filter
 
 router = APIRouter(prefix="/api")
 
@@ -40,7 +46,7 @@ async def verify_admin(token: str):
 
 @router.post("/admin/logout")
 async def admin_logout(token: str):
-    await db.admin_sessions.update_one({"token": token}, {"$set": {"active": False}})
+    await end_admin_session(token)
     return {"success": True}
 
 @router.post("/admin/change-password")
@@ -59,7 +65,9 @@ async def change_password(token: str, old_password: str, new_password: str):
         {"$set": {"admin_password_hash": hash_password(new_password), "type": "admin"}},
         upsert=True
     )
-    return {"success": True}
+    # Sessions opened with the old password end here
+    token = await end_other_admin_sessions(token)
+    return {"success": True, "token": token}
 
 # ============== Dashboard Stats ==============
 
@@ -73,6 +81,7 @@ async def get_dashboard_stats(token: str):
     total_pages = await db.pages.count_documents({})
     total_gallery = await db.gallery_images.count_documents({})
     total_posts = await db.blog_posts.count_documents({})
+    admin_sessions = await db.admin_sessions.estimated_document_count()
     
     donations = await db.admin_settings.find_one({"type": "donations"})
     donations_count = donations.get('count', 0) if donations else 0
@@ -83,9 +92,29 @@ async def get_dashboard_stats(token: str):
         total_pages=total_pages,
         total_gallery=total_gallery,
         total_posts=total_posts,
-        donations_count=donations_count
+        donations_count=donations_count,
+        admin_sessions=admin_sessions
     )
 
+@router.get("/admin/metrics/queries")
+async def get_query_metrics(token: str, reset: bool = False):
+    """MongoDB time per route (count, p50/p95/p99), recent slow queries and the circuit breaker"""
+    if not await verify_admin_session(token):
+        raise HTTPException(status_code=401, detail="Nicht autorisiert")
+    snapshot = {**query_metrics.snapshot(), "circuit_breaker": db_breaker.stats()}
+    if reset:
+        query_metrics.reset()
+    return snapshot
+
+@router.post("/admin/publish")
+async def publish_snapshot(token: str):
+    """Export the public content as static JSON now (see ``publish.py``)"""
+    if not await verify_admin_session(token):
+        raise HTTPException(status_code=401, detail="Nicht autorisiert")
+    if not publisher.enabled:
+        raise HTTPException(status_code=400, detail="Snapshot-Export ist nicht konfiguriert (SNAPSHOT_DIR)")
+    return await publisher.publish()
+
 @router.post("/admin/donations/increment")
 async def increment_donations(token: str):
     if not await verify_admin_session(token):
@@ -101,33 +130,41 @@ async def increment_donations(token: str):
 # ============== Site Settings ==============
 
 @router.get("/settings", response_model=SiteSettings)
-async def get_site_settings():
-    settings = await db.site_settings.find_one({"type": "main"}, {"_id": 0})
-    if settings:
-        return SiteSettings(**settings)
-    return SiteSettings()
+async def get_site_settings(request: Request):
+    etag = content_etag("settings")
+    cached = not_modified(request, etag, "settings")
+    if cached:
+        return cached
+    body = response_cache.get(("settings",))
+    if body is None:
+        settings = await db_breaker.call(lambda: db.site_settings.find_one({"type": "main"}, {"_id": 0}))
+        body = response_cache.put(("settings",), SiteSettings(**settings) if settings else SiteSettings())
+    return set_cache_headers(json_body_response(body), etag, "settings")
 
 @router.post("/settings", response_model=SiteSettings)
 async def save_site_settings(settings: SiteSettings, token: str = None):
     settings_dict = settings.model_dump()
     settings_dict["type"] = "main"
-    settings_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    settings_dict["updated_at"] = datetime.now(timezone.utc)
     
     await db.site_settings.update_one(
         {"type": "main"},
         {"$set": settings_dict},
         upsert=True
     )
+    response_cache.invalidate(("settings",))
+    content_versions.bump("settings")
     return settings
 
 # ============== Structured Page Content (Impressum, Datenschutz, Cookies) ==============
 
 @router.get("/page-content/impressum")
 async def get_impressum_content():
-    content = await db.page_content.find_one({"type": "impressum"}, {"_id": 0})
-    if content:
-        return content
-    return ImpressumContent().model_dump()
+    body = response_cache.get(("page_content", "impressum"))
+    if body is None:
+        content = await db_breaker.call(lambda: db.page_content.find_one({"type": "impressum"}, {"_id": 0}))
+        body = response_cache.put(("page_content", "impressum"), content or ImpressumContent().model_dump())
+    return json_body_response(body)
 
 @router.get("/admin/page-content/impressum")
 async def get_admin_impressum_content(token: str):
@@ -145,21 +182,24 @@ async def update_impressum_content(content: ImpressumContent, token: str):
     
     content_dict = content.model_dump()
     content_dict["type"] = "impressum"
-    content_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content_dict["updated_at"] = datetime.now(timezone.utc)
     
     await db.page_content.update_one(
         {"type": "impressum"},
         {"$set": content_dict},
         upsert=True
     )
+    response_cache.invalidate(("page_content", "impressum"))
+    content_versions.bump("legal")
     return {"success": True}
 
 @router.get("/page-content/datenschutz")
 async def get_datenschutz_content():
-    content = await db.page_content.find_one({"type": "datenschutz"}, {"_id": 0})
-    if content:
-        return content
-    return DatenschutzContent().model_dump()
+    body = response_cache.get(("page_content", "datenschutz"))
+    if body is None:
+        content = await db_breaker.call(lambda: db.page_content.find_one({"type": "datenschutz"}, {"_id": 0}))
+        body = response_cache.put(("page_content", "datenschutz"), content or DatenschutzContent().model_dump())
+    return json_body_response(body)
 
 @router.get("/admin/page-content/datenschutz")
 async def get_admin_datenschutz_content(token: str):
@@ -177,21 +217,24 @@ async def update_datenschutz_content(content: DatenschutzContent, token: str):
     
     content_dict = content.model_dump()
     content_dict["type"] = "datenschutz"
-    content_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content_dict["updated_at"] = datetime.now(timezone.utc)
     
     await db.page_content.update_one(
         {"type": "datenschutz"},
         {"$set": content_dict},
         upsert=True
     )
+    response_cache.invalidate(("page_content", "datenschutz"))
+    content_versions.bump("legal")
     return {"success": True}
 
 @router.get("/page-content/cookies")
 async def get_cookies_content():
-    content = await db.page_content.find_one({"type": "cookies"}, {"_id": 0})
-    if content:
-        return content
-    return CookiesContent().model_dump()
+    body = response_cache.get(("page_content", "cookies"))
+    if body is None:
+        content = await db_breaker.call(lambda: db.page_content.find_one({"type": "cookies"}, {"_id": 0}))
+        body = response_cache.put(("page_content", "cookies"), content or CookiesContent().model_dump())
+    return json_body_response(body)
 
 @router.get("/admin/page-content/cookies")
 async def get_admin_cookies_content(token: str):
@@ -209,13 +252,15 @@ async def update_cookies_content(content: CookiesContent, token: str):
     
     content_dict = content.model_dump()
     content_dict["type"] = "cookies"
-    content_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content_dict["updated_at"] = datetime.now(timezone.utc)
     
     await db.page_content.update_one(
         {"type": "cookies"},
         {"$set": content_dict},
         upsert=True
     )
+    response_cache.invalidate(("page_content", "cookies"))
+    content_versions.bump("legal")
     return {"success": True}
 
 # ============== Trash Management ==============
@@ -227,15 +272,9 @@ async def cleanup_trash(token: str):
     
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
     
-    pages_result = await db.pages.delete_many({
-        "status": "deleted",
-        "deleted_at": {"$lt": thirty_days_ago.isoformat()}
-    })
+    pages_result = await db.pages.delete_many(expired_trash_filter(thirty_days_ago))
     
-    posts_result = await db.blog_posts.delete_many({
-        "status": "deleted", 
-        "deleted_at": {"$lt": thirty_days_ago.isoformat()}
-    })
+    posts_result = await db.blog_posts.delete_many(expired_trash_filter(thirty_days_ago))
     
     return {
         "success": True,
@@ -1,63 +1,113 @@
 """Blog routes - CRUD operations for blog posts"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 from database import db
 from models import BlogPost, BlogPostCreate
+from queries import not_deleted_filter
 from utils.auth import verify_admin_session
+from utils.cache import SingleFlight, content_versions, json_body_response, render_json
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import content_etag, not_modified, set_cache_headers
+from utils.pagination import fetch_page, page_size, set_next_cursor
+from utils.projection import list_projection, projection_key
+from utils.search_index import search_index
 
 router = APIRouter(prefix="/api")
 
 # ============== Public Blog API ==============
 
+# Index pages and single posts; the last good copy is served while the
+# database is down
+blog_flight = SingleFlight(max_entries=256, breaker=db_breaker)
+
+PUBLIC_BLOG_SORT = [("created_at", -1), ("id", 1)]
+ADMIN_POSTS_SORT = [("publish_date", -1), ("id", 1)]
+
 @router.get("/blog")
-async def get_public_blog(limit: int = 10):
-    posts = await db.blog_posts.find({"status": "live"}, {"_id": 0}).sort("created_at", -1).to_list(limit)
-    result = []
-    for p in posts:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        result.append(p)
-    return result
+async def get_public_blog(request: Request, limit: int = 10, cursor: str = None,
+                          view: str = None, fields: str = None):
+    """Live posts, newest first; further pages via ``X-Next-Cursor``
+
+    ``view=summary`` omits ``content``, ``fields=`` selects fields.
+    """
+    projection = list_projection(BlogPost, view, fields, always=[f for f, _ in PUBLIC_BLOG_SORT])
+    variant = (cursor, projection_key(projection))
+    cached = not_modified(request, content_etag("blog", *variant), "blog")
+    if cached:
+        return cached
+    limit = page_size(limit)
+
+    async def load() -> tuple:
+        etag = content_etag("blog", *variant)
+        posts, next_cursor = await fetch_page(
+            db.blog_posts, {"status": "live"}, PUBLIC_BLOG_SORT, limit, cursor, projection)
+        return etag, render_json(posts), next_cursor
+
+    etag, body, next_cursor = await blog_flight.get(
+        ("blog", limit, *variant), load, content_versions.get("blog"))
+    response = json_body_response(body)
+    set_next_cursor(response, next_cursor)
+    return set_cache_headers(response, etag, "blog")
 
 @router.get("/blog/{post_id}")
-async def get_blog_post(post_id: str):
-    post = await db.blog_posts.find_one({"id": post_id, "status": "live"}, {"_id": 0})
-    if not post:
+async def get_blog_post(post_id: str, request: Request):
+    cached = not_modified(request, content_etag("blog"), "blog")
+    if cached:
+        return cached
+
+    async def load() -> Optional[tuple]:
+        etag = content_etag("blog")
+        post = await db.blog_posts.find_one({"id": post_id, "status": "live"}, {"_id": 0})
+        return (etag, render_json(post)) if post else None
+
+    entry = await blog_flight.get(
+        ("post", post_id), load, content_versions.get("blog"))
+    if entry is None:
         raise HTTPException(status_code=404, detail="Beitrag nicht gefunden")
-    return post
+    etag, body = entry
+    return set_cache_headers(json_body_response(body), etag, "blog")
 
 # ============== Admin Blog CRUD ==============
 
 @router.get("/admin/posts", response_model=List[BlogPost])
-async def get_all_posts(token: str, include_deleted: bool = False):
+async def get_all_posts(token: str, response: Response, include_deleted: bool = False,
+                        limit: int = 100, cursor: str = None, view: str = None, fields: str = None):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
-    query = {} if include_deleted else {"status": {"$ne": "deleted"}}
-    posts = await db.blog_posts.find(query, {"_id": 0}).sort("publish_date", -1).to_list(100)
+    projection = list_projection(BlogPost, view, fields, always=[f for f, _ in ADMIN_POSTS_SORT])
+    query = {} if include_deleted else not_deleted_filter()
+    posts, next_cursor = await fetch_page(
+        db.blog_posts, query, ADMIN_POSTS_SORT, page_size(limit), cursor, projection)
+    if projection:
+        # Partial documents: serialized as stored, without the model
+        response = json_body_response(render_json(posts))
+        set_next_cursor(response, next_cursor)
+        return response
+    set_next_cursor(response, next_cursor)
     result = []
     for p in posts:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        if isinstance(p.get('updated_at'), str):
-            p['updated_at'] = datetime.fromisoformat(p['updated_at'])
-        if isinstance(p.get('publish_date'), str):
-            p['publish_date'] = datetime.fromisoformat(p['publish_date'])
-        if isinstance(p.get('deleted_at'), str):
-            p['deleted_at'] = datetime.fromisoformat(p['deleted_at'])
         if 'publish_date' not in p:
             p['publish_date'] = p.get('created_at', datetime.now(timezone.utc))
         result.append(BlogPost(**p))
     return result
 
+def parse_publish_date(value: str) -> datetime:
+    """ISO string -> aware datetime (naive values are UTC), like stored dates"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Ungültiges Veröffentlichungsdatum")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
 @router.post("/admin/posts", response_model=BlogPost)
 async def create_post(post: BlogPostCreate, token: str):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
-    publish_date = datetime.fromisoformat(post.publish_date) if post.publish_date else datetime.now(timezone.utc)
+    publish_date = parse_publish_date(post.publish_date) if post.publish_date else datetime.now(timezone.utc)
     
     new_post = BlogPost(
         title=post.title,
@@ -70,11 +120,10 @@ async def create_post(post: BlogPostCreate, token: str):
     )
     
     doc = new_post.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
-    doc['publish_date'] = doc['publish_date'].isoformat()
     
     await db.blog_posts.insert_one(doc)
+    await search_index.reindex("posts", new_post.id)
+    content_versions.bump("blog")
     return new_post
 
 @router.put("/admin/posts/{post_id}", response_model=BlogPost)
@@ -83,19 +132,15 @@ async def update_post(post_id: str, post: BlogPostCreate, token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     update_data = post.model_dump()
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    update_data['updated_at'] = datetime.now(timezone.utc)
     if post.publish_date:
-        update_data['publish_date'] = post.publish_date
+        update_data['publish_date'] = parse_publish_date(post.publish_date)
     
     await db.blog_posts.update_one({"id": post_id}, {"$set": update_data})
+    await search_index.reindex("posts", post_id)
+    content_versions.bump("blog")
     
     updated = await db.blog_posts.find_one({"id": post_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    if isinstance(updated.get('updated_at'), str):
-        updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
-    if isinstance(updated.get('publish_date'), str):
-        updated['publish_date'] = datetime.fromisoformat(updated['publish_date'])
     if 'publish_date' not in updated or updated['publish_date'] is None:
         updated['publish_date'] = updated.get('created_at', datetime.now(timezone.utc))
     return BlogPost(**updated)
@@ -110,8 +155,10 @@ async def delete_post(post_id: str, token: str, permanent: bool = False):
     else:
         await db.blog_posts.update_one(
             {"id": post_id},
-            {"$set": {"status": "deleted", "deleted_at": datetime.now(timezone.utc).isoformat()}}
+            {"$set": {"status": "deleted", "deleted_at": datetime.now(timezone.utc)}}
         )
+    await search_index.reindex("posts", post_id)
+    content_versions.bump("blog")
     return {"success": True}
 
 @router.post("/admin/posts/{post_id}/restore")
@@ -123,6 +170,8 @@ async def restore_post(post_id: str, token: str):
         {"id": post_id},
         {"$set": {"status": "draft", "deleted_at": None}}
     )
+    await search_index.reindex("posts", post_id)
+    content_versions.bump("blog")
     return {"success": True}
 
 @router.get("/admin/posts/trash")
@@ -131,13 +180,4 @@ async def get_trashed_posts(token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     posts = await db.blog_posts.find({"status": "deleted"}, {"_id": 0}).to_list(100)
-    result = []
-    for p in posts:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        if isinstance(p.get('deleted_at'), str):
-            p['deleted_at'] = datetime.fromisoformat(p['deleted_at'])
-        if isinstance(p.get('publish_date'), str):
-            p['publish_date'] = datetime.fromisoformat(p['publish_date'])
-        result.append(p)
-    return result
+    return posts
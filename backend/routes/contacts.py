@@ -1,5 +1,5 @@
 """Contact routes - Contact form and submissions"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from datetime import datetime, timezone
 from typing import List
 import uuid
@@ -7,6 +7,7 @@ import uuid
 from database import db
 from models import ContactSubmission, ContactFormInput
 from utils.auth import verify_admin_session
+from utils.pagination import fetch_page, page_size, set_next_cursor
 
 router = APIRouter(prefix="/api")
 
@@ -23,7 +24,7 @@ async def submit_contact_form(form: ContactFormInput):
         "email": form.email,
         "thema": form.thema,
         "nachricht": form.nachricht,
-        "timestamp": timestamp.isoformat(),
+        "timestamp": timestamp,
         "status": "neu"
     }
     
@@ -32,8 +33,11 @@ async def submit_contact_form(form: ContactFormInput):
 
 # ============== Admin Contacts ==============
 
+CONTACTS_SORT = [("timestamp", -1), ("id", 1)]
+
 @router.get("/admin/contacts", response_model=List[ContactSubmission])
-async def get_all_contacts(token: str, status: str = None):
+async def get_all_contacts(token: str, response: Response, status: str = None,
+                           limit: int = 500, cursor: str = None):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
@@ -41,13 +45,9 @@ async def get_all_contacts(token: str, status: str = None):
     if status:
         query["status"] = status
     
-    contacts = await db.contact_submissions.find(query, {"_id": 0}).sort("timestamp", -1).to_list(500)
-    result = []
-    for c in contacts:
-        if isinstance(c.get('timestamp'), str):
-            c['timestamp'] = datetime.fromisoformat(c['timestamp'])
-        result.append(ContactSubmission(**c))
-    return result
+    contacts, next_cursor = await fetch_page(db.contact_submissions, query, CONTACTS_SORT, page_size(limit), cursor)
+    set_next_cursor(response, next_cursor)
+    return [ContactSubmission(**c) for c in contacts]
 
 @router.put("/admin/contacts/{contact_id}/status")
 async def update_contact_status(contact_id: str, token: str, status: str):
@@ -1,25 +1,42 @@
 """Gallery routes - CRUD operations for gallery images"""
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 
 from database import db
 from models import GalleryImage
 from utils.auth import verify_admin_session
+from utils.cache import SingleFlight, content_versions, json_body_response, render_json
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import content_etag, not_modified, set_cache_headers
+from utils.pagination import fetch_page, page_size, set_next_cursor
+from utils.search_index import search_index
 
 router = APIRouter(prefix="/api")
 
 # ============== Public Gallery ==============
 
+gallery_flight = SingleFlight(max_entries=64, breaker=db_breaker)
+
+GALLERY_SORT = [("order", 1), ("id", 1)]
+
 @router.get("/gallery")
-async def get_public_gallery():
-    images = await db.gallery_images.find({}, {"_id": 0}).sort("order", 1).to_list(100)
-    result = []
-    for img in images:
-        if isinstance(img.get('created_at'), str):
-            img['created_at'] = datetime.fromisoformat(img['created_at'])
-        result.append(img)
-    return result
+async def get_public_gallery(request: Request, limit: int = 100, cursor: str = None):
+    """Gallery images in display order; further pages via ``X-Next-Cursor``"""
+    cached = not_modified(request, content_etag("gallery", cursor), "gallery")
+    if cached:
+        return cached
+    limit = page_size(limit)
+
+    async def load() -> tuple:
+        etag = content_etag("gallery", cursor)
+        images, next_cursor = await fetch_page(db.gallery_images, {}, GALLERY_SORT, limit, cursor)
+        return etag, render_json(images), next_cursor
+
+    etag, body, next_cursor = await gallery_flight.get(
+        ("gallery", limit, cursor), load, content_versions.get("gallery"))
+    response = json_body_response(body)
+    set_next_cursor(response, next_cursor)
+    return set_cache_headers(response, etag, "gallery")
 
 # ============== Admin Gallery CRUD ==============
 
@@ -29,12 +46,7 @@ async def get_all_gallery(token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     images = await db.gallery_images.find({}, {"_id": 0}).sort("order", 1).to_list(100)
-    result = []
-    for img in images:
-        if isinstance(img.get('created_at'), str):
-            img['created_at'] = datetime.fromisoformat(img['created_at'])
-        result.append(GalleryImage(**img))
-    return result
+    return [GalleryImage(**img) for img in images]
 
 @router.post("/admin/gallery")
 async def add_gallery_image(token: str, url: str, title: str = "", alt: str = "", tags: str = ""):
@@ -51,9 +63,10 @@ async def add_gallery_image(token: str, url: str, title: str = "", alt: str = ""
     )
     
     doc = image.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.gallery_images.insert_one(doc)
+    await search_index.reindex("gallery", image.id)
+    content_versions.bump("gallery")
     return {"success": True, "id": image.id}
 
 @router.put("/admin/gallery/{image_id}")
@@ -73,6 +86,8 @@ async def update_gallery_image(image_id: str, token: str, title: str = None, alt
     if externalLink is not None: update_data['externalLink'] = externalLink
     
     await db.gallery_images.update_one({"id": image_id}, {"$set": update_data})
+    await search_index.reindex("gallery", image_id)
+    content_versions.bump("gallery")
     return {"success": True}
 
 @router.delete("/admin/gallery/{image_id}")
@@ -83,4 +98,6 @@ async def delete_gallery_image(image_id: str, token: str):
     result = await db.gallery_images.delete_one({"id": image_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Bild nicht gefunden")
+    search_index.remove("gallery", image_id)
+    content_versions.bump("gallery")
     return {"success": True}
@@ -0,0 +1,91 @@
+"""Home route - everything the landing page needs in one response"""
+from fastapi import APIRouter, Request, Response
+import asyncio
+import gzip
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from database import db
+from models import SiteSettings
+from routes.landing import DEFAULT_LANDING_CONTENT
+from routes.news import load_public_news, seconds_until
+from utils.cache import SingleFlight, content_versions, render_json
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import accepts_gzip, not_modified, set_cache_headers
+
+router = APIRouter(prefix="/api")
+
+# Content scopes the bundle is built from
+HOME_SCOPES = ("settings", "landing", "blog", "gallery", "news")
+
+# Cached until a write or the next news start/end date
+home_flight = SingleFlight(max_entries=1, breaker=db_breaker,
+                           ttl_for=lambda entry: seconds_until(entry[3]))
+
+async def _nothing(default):
+    return default
+
+async def _no_news():
+    return [], None
+
+async def build_home_bundle() -> Tuple[dict, Optional[datetime]]:
+    """Fetch settings, landing content and the enabled sections concurrently
+
+    Also returns when the visible news change next.
+    """
+    settings, landing = await asyncio.gather(
+        db.site_settings.find_one({"type": "main"}, {"_id": 0}),
+        db.landing_content.find_one({"type": "main"}, {"_id": 0}),
+    )
+    landing = landing or DEFAULT_LANDING_CONTENT
+
+    blog_limit = landing.get("blog_max_posts") or 4
+    blog, (news, next_change), gallery = await asyncio.gather(
+        # Cards only: everything but the post body
+        db.blog_posts.find({"status": "live"}, {"_id": 0, "content": 0}).sort("created_at", -1).to_list(blog_limit)
+        if landing.get("blog_enabled", True) else _nothing([]),
+        load_public_news() if landing.get("news_enabled", True) else _no_news(),
+        db.gallery_images.find({}, {"_id": 0}).sort("order", 1).to_list(100)
+        if landing.get("gallery_carousel_enabled", True) else _nothing([]),
+    )
+    return {
+        "settings": SiteSettings(**settings) if settings else SiteSettings(),
+        "landing": landing,
+        "blog": blog,
+        "news": news,
+        "gallery": gallery,
+    }, next_change
+
+async def load_home_entry() -> tuple:
+    """(entity tag base, JSON body, gzip body, next news change) of the bundle"""
+    bundle, next_change = await build_home_bundle()
+    body = render_json(bundle)
+    tag = "home-" + hashlib.sha1(body).hexdigest()[:16]
+    return tag, body, gzip.compress(body, compresslevel=6), next_change
+
+@router.get("/home")
+async def get_home(request: Request):
+    """Landing page bundle: settings, landing content, blog, news, gallery
+
+    Cached as JSON and gzip bytes until a write to one of ``HOME_SCOPES``
+    or the next news start/end date; the last good bundle is served while
+    the database is down. The two encodings are separate representations
+    with their own ETag.
+    """
+    tag, body, compressed, next_change = await home_flight.get(
+        "home", load_home_entry, content_versions.key(*HOME_SCOPES))
+
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding"))
+    etag = f'"{tag}-gz"' if use_gzip else f'"{tag}"'
+    response = not_modified(request, etag, "home")
+    if response is None:
+        if use_gzip:
+            response = Response(content=compressed, media_type="application/json",
+                                headers={"Content-Encoding": "gzip"})
+        else:
+            response = Response(content=body, media_type="application/json")
+        remaining = seconds_until(next_change)
+        set_cache_headers(response, etag, "home", max_age=int(remaining) if remaining is not None else None)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -1,9 +1,12 @@
 """Landing page routes - Customizable landing page content"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime, timezone
 
 from database import db
 from utils.auth import verify_admin_session
+from utils.cache import SingleFlight, content_versions, json_body_response, render_json
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import content_etag, not_modified, set_cache_headers
 
 router = APIRouter(prefix="/api")
 
@@ -42,13 +45,24 @@ DEFAULT_LANDING_CONTENT = {
     "custom_sections": []
 }
 
+# Concurrent readers share one fetch; the old body is served while it reloads
+landing_flight = SingleFlight(max_entries=1, breaker=db_breaker)
+
+async def load_landing_body() -> tuple:
+    """(etag, serialized body) of the current landing content"""
+    etag = content_etag("landing")
+    content = await db.landing_content.find_one({"type": "main"}, {"_id": 0})
+    return etag, render_json(content or DEFAULT_LANDING_CONTENT)
+
 @router.get("/landing-content")
-async def get_landing_content():
+async def get_landing_content(request: Request):
     """Get landing page content for public display"""
-    content = await db.landing_content.find_one({"type": "main"}, {"_id": 0})
-    if content:
-        return content
-    return DEFAULT_LANDING_CONTENT
+    cached = not_modified(request, content_etag("landing"), "landing")
+    if cached:
+        return cached
+    etag, body = await landing_flight.get(
+        "landing", load_landing_body, content_versions.get("landing"))
+    return set_cache_headers(json_body_response(body), etag, "landing")
 
 @router.get("/admin/landing-content")
 async def get_admin_landing_content(token: str):
@@ -65,11 +79,12 @@ async def update_landing_content(content: dict, token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     content["type"] = "main"
-    content["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content["updated_at"] = datetime.now(timezone.utc)
     
     await db.landing_content.update_one(
         {"type": "main"},
         {"$set": content},
         upsert=True
     )
+    content_versions.bump("landing")
     return {"success": True}
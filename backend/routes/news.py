@@ -1,37 +1,61 @@
 """News routes - News/Announcements for landing page"""
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Request
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import asyncio
 
 from database import db
 from models import NewsItem, NewsItemCreate
+from queries import ending_news_filter, upcoming_news_filter, visible_news_filter
 from utils.auth import verify_admin_session
+from utils.cache import SingleFlight, content_versions, json_body_response, render_json
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import content_etag, not_modified, set_cache_headers
 
 router = APIRouter(prefix="/api")
 
 # ============== Public News ==============
 
+async def load_public_news() -> Tuple[list, Optional[datetime]]:
+    """Visible news items, and the next time one starts or ends (or None)"""
+    now = datetime.now(timezone.utc)
+    news, starts, ends = await asyncio.gather(
+        db.news.find(visible_news_filter(now), {"_id": 0}).sort("order", 1).to_list(20),
+        db.news.find(upcoming_news_filter(now), {"_id": 0, "start_date": 1})
+        .sort("start_date", 1).limit(1).to_list(1),
+        db.news.find(ending_news_filter(now), {"_id": 0, "end_date": 1})
+        .sort("end_date", 1).limit(1).to_list(1),
+    )
+    # An item is hidden once the clock is past its end_date
+    changes = [n["start_date"] for n in starts] + [n["end_date"] + timedelta(milliseconds=1) for n in ends]
+    return news, min(changes) if changes else None
+
+def seconds_until(moment: Optional[datetime]) -> Optional[float]:
+    """Cache lifetime for content that changes at ``moment``"""
+    if moment is None:
+        return None
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+# Cached until the next start/end date or write
+news_flight = SingleFlight(max_entries=1, breaker=db_breaker,
+                           ttl_for=lambda entry: seconds_until(entry[2]))
+
+async def load_news_entry() -> tuple:
+    """(etag, serialized body, next change) of the currently visible news"""
+    news, next_change = await load_public_news()
+    return content_etag("news", [n.get("id") for n in news]), render_json(news), next_change
+
 @router.get("/news")
-async def get_public_news():
+async def get_public_news(request: Request):
     """Get all live news items for public display"""
-    now = datetime.now(timezone.utc)
-    news = await db.news.find({"status": "live"}, {"_id": 0}).sort("order", 1).to_list(20)
-    
-    filtered = []
-    for n in news:
-        start = n.get('start_date')
-        end = n.get('end_date')
-        if start and isinstance(start, str):
-            start = datetime.fromisoformat(start)
-        if end and isinstance(end, str):
-            end = datetime.fromisoformat(end)
-        
-        if start and start > now:
-            continue
-        if end and end < now:
-            continue
-        filtered.append(n)
-    
-    return filtered
+    etag, body, next_change = await news_flight.get(
+        "news", load_news_entry, content_versions.get("news"))
+    cached = not_modified(request, etag, "news")
+    if cached:
+        return cached
+    remaining = seconds_until(next_change)
+    max_age = int(remaining) if remaining is not None else None
+    return set_cache_headers(json_body_response(body), etag, "news", max_age=max_age)
 
 # ============== Admin News CRUD ==============
 
@@ -59,9 +83,9 @@ async def create_news(news: NewsItemCreate, token: str):
     )
     
     doc = new_item.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.news.insert_one(doc)
+    content_versions.bump("news")
     return {"success": True, "id": new_item.id}
 
 @router.put("/admin/news/{news_id}")
@@ -71,6 +95,7 @@ async def update_news(news_id: str, news: NewsItemCreate, token: str):
     
     update_data = news.model_dump()
     await db.news.update_one({"id": news_id}, {"$set": update_data})
+    content_versions.bump("news")
     return {"success": True}
 
 @router.delete("/admin/news/{news_id}")
@@ -79,4 +104,5 @@ async def delete_news(news_id: str, token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     await db.news.delete_one({"id": news_id})
+    content_versions.bump("news")
     return {"success": True}
@@ -1,50 +1,70 @@
 """Pages routes - CRUD operations for dynamic pages"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 import uuid
 
 from database import db
 from models import PageModel, PageCreate
+from queries import not_deleted_filter
 from utils.auth import verify_admin_session
+from utils.cache import SingleFlight, content_versions, json_body_response, render_json
+from utils.circuit_breaker import db_breaker
+from utils.pagination import fetch_page, page_size, set_next_cursor
+from utils.projection import list_projection
+from utils.search_index import search_index
 
 router = APIRouter(prefix="/api")
 
 # ============== Public Pages API ==============
 
+# Keyed by slug; served from the last good copy while the database is down
+pages_flight = SingleFlight(max_entries=256, breaker=db_breaker)
+
 @router.get("/pages")
 async def get_public_pages():
     """Get all live pages for public display"""
-    pages = await db.pages.find({"status": "live"}, {"_id": 0}).sort("order", 1).to_list(100)
-    return pages
+    async def load() -> bytes:
+        pages = await db.pages.find({"status": "live"}, {"_id": 0}).sort("order", 1).to_list(100)
+        return render_json(pages)
+
+    body = await pages_flight.get(
+        ("pages",), load, content_versions.get("pages"))
+    return json_body_response(body)
 
 @router.get("/pages/{slug}")
 async def get_page_by_slug(slug: str):
     """Get a single page by its slug"""
-    page = await db.pages.find_one({"slug": slug, "status": "live"}, {"_id": 0})
-    if not page:
+    async def load() -> Optional[bytes]:
+        page = await db.pages.find_one({"slug": slug, "status": "live"}, {"_id": 0})
+        return render_json(page) if page else None
+
+    body = await pages_flight.get(
+        ("page", slug), load, content_versions.get("pages"))
+    if body is None:
         raise HTTPException(status_code=404, detail="Seite nicht gefunden")
-    return page
+    return json_body_response(body)
 
 # ============== Admin Pages CRUD ==============
 
+ADMIN_PAGES_SORT = [("order", 1), ("id", 1)]
+
 @router.get("/admin/pages", response_model=List[PageModel])
-async def get_all_pages(token: str, include_deleted: bool = False):
+async def get_all_pages(token: str, response: Response, include_deleted: bool = False,
+                        limit: int = 100, cursor: str = None, view: str = None, fields: str = None):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
-    query = {} if include_deleted else {"status": {"$ne": "deleted"}}
-    pages = await db.pages.find(query, {"_id": 0}).sort("order", 1).to_list(100)
-    result = []
-    for p in pages:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        if isinstance(p.get('updated_at'), str):
-            p['updated_at'] = datetime.fromisoformat(p['updated_at'])
-        if isinstance(p.get('deleted_at'), str):
-            p['deleted_at'] = datetime.fromisoformat(p['deleted_at'])
-        result.append(PageModel(**p))
-    return result
+    projection = list_projection(PageModel, view, fields, always=[f for f, _ in ADMIN_PAGES_SORT])
+    query = {} if include_deleted else not_deleted_filter()
+    pages, next_cursor = await fetch_page(db.pages, query, ADMIN_PAGES_SORT, page_size(limit), cursor, projection)
+    if projection:
+        # Partial documents: serialized as stored, without the model
+        response = json_body_response(render_json(pages))
+        set_next_cursor(response, next_cursor)
+        return response
+    set_next_cursor(response, next_cursor)
+    return [PageModel(**p) for p in pages]
 
 @router.post("/admin/pages", response_model=PageModel)
 async def create_page(page: PageCreate, token: str):
@@ -62,10 +82,10 @@ async def create_page(page: PageCreate, token: str):
     )
     
     doc = new_page.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
     await db.pages.insert_one(doc)
+    await search_index.reindex("pages", new_page.id)
+    content_versions.bump("pages")
     return new_page
 
 @router.put("/admin/pages/{page_id}", response_model=PageModel)
@@ -74,17 +94,16 @@ async def update_page(page_id: str, page: PageCreate, token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     update_data = page.model_dump()
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    update_data['updated_at'] = datetime.now(timezone.utc)
     
     result = await db.pages.update_one({"id": page_id}, {"$set": update_data})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Seite nicht gefunden")
     
+    await search_index.reindex("pages", page_id)
+    content_versions.bump("pages")
+    
     updated = await db.pages.find_one({"id": page_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    if isinstance(updated.get('updated_at'), str):
-        updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
     return PageModel(**updated)
 
 @router.delete("/admin/pages/{page_id}")
@@ -99,10 +118,12 @@ async def delete_page(page_id: str, token: str, permanent: bool = False):
     else:
         result = await db.pages.update_one(
             {"id": page_id},
-            {"$set": {"status": "deleted", "deleted_at": datetime.now(timezone.utc).isoformat()}}
+            {"$set": {"status": "deleted", "deleted_at": datetime.now(timezone.utc)}}
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Seite nicht gefunden")
+    await search_index.reindex("pages", page_id)
+    content_versions.bump("pages")
     return {"success": True}
 
 @router.post("/admin/pages/{page_id}/restore")
@@ -116,6 +137,8 @@ async def restore_page(page_id: str, token: str):
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Seite nicht gefunden")
+    await search_index.reindex("pages", page_id)
+    content_versions.bump("pages")
     return {"success": True}
 
 @router.get("/admin/pages/trash")
@@ -124,16 +147,7 @@ async def get_trashed_pages(token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     pages = await db.pages.find({"status": "deleted"}, {"_id": 0}).to_list(100)
-    result = []
-    for p in pages:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        if isinstance(p.get('updated_at'), str):
-            p['updated_at'] = datetime.fromisoformat(p['updated_at'])
-        if isinstance(p.get('deleted_at'), str):
-            p['deleted_at'] = datetime.fromisoformat(p['deleted_at'])
-        result.append(p)
-    return result
+    return pages
 
 @router.post("/admin/pages/{page_id}/duplicate")
 async def duplicate_page(page_id: str, token: str):
@@ -149,10 +163,11 @@ async def duplicate_page(page_id: str, token: str):
     new_page['title'] = f"{original['title']} (Kopie)"
     new_page['slug'] = f"{original['slug']}-kopie"
     new_page['status'] = "draft"
-    new_page['created_at'] = datetime.now(timezone.utc).isoformat()
-    new_page['updated_at'] = datetime.now(timezone.utc).isoformat()
+    new_page['created_at'] = datetime.now(timezone.utc)
+    new_page['updated_at'] = datetime.now(timezone.utc)
     
     await db.pages.insert_one(new_page)
+    content_versions.bump("pages")
     return {"success": True, "id": new_page['id']}
 
 @router.post("/admin/pages/init-defaults")
@@ -195,10 +210,13 @@ Deutschland</p>
             new_page = {
                 "id": str(uuid.uuid4()),
                 **page_data,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
             }
             await db.pages.insert_one(new_page)
+            await search_index.reindex("pages", new_page["id"])
             created += 1
     
+    if created:
+        content_versions.bump("pages")
     return {"success": True, "created": created}
@@ -1,12 +1,19 @@
 """Static pages routes - Schwangerschaft, BabyAlltag, Tipps, etc."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime, timezone
 
 from database import db
 from utils.auth import verify_admin_session
+from utils.cache import content_versions, json_body_response, response_cache
+from utils.circuit_breaker import db_breaker
+from utils.http_cache import content_etag, not_modified, set_cache_headers
+from utils.search_index import search_index, static_search_document
 
 router = APIRouter(prefix="/api")
 
+# The precomputed search blob stays internal
+PAGE_PROJECTION = {"_id": 0, "search_document": 0}
+
 # Default content for each page
 STATIC_PAGE_DEFAULTS = {
     "schwangerschaft": {
@@ -77,13 +84,19 @@ STATIC_PAGE_DEFAULTS = {
 }
 
 @router.get("/static-pages/{page_id}")
-async def get_static_page_content(page_id: str):
+async def get_static_page_content(page_id: str, request: Request):
     """Get static page content for public display"""
-    content = await db.static_pages.find_one({"page_id": page_id}, {"_id": 0})
-    if content:
-        return content
-    defaults = STATIC_PAGE_DEFAULTS.get(page_id, {})
-    return {"page_id": page_id, **defaults}
+    etag = content_etag("static_pages")
+    cached = not_modified(request, etag, "static_pages")
+    if cached:
+        return cached
+    body = response_cache.get(("static_page", page_id))
+    if body is None:
+        content = await db_breaker.call(lambda: db.static_pages.find_one({"page_id": page_id}, PAGE_PROJECTION))
+        if not content:
+            content = {"page_id": page_id, **STATIC_PAGE_DEFAULTS.get(page_id, {})}
+        body = response_cache.put(("static_page", page_id), content)
+    return set_cache_headers(json_body_response(body), etag, "static_pages")
 
 @router.get("/admin/static-pages")
 async def get_all_static_pages(token: str):
@@ -91,7 +104,7 @@ async def get_all_static_pages(token: str):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
-    pages = await db.static_pages.find({}, {"_id": 0}).to_list(100)
+    pages = await db.static_pages.find({}, PAGE_PROJECTION).to_list(100)
     result = {}
     for page_id, defaults in STATIC_PAGE_DEFAULTS.items():
         result[page_id] = {"page_id": page_id, **defaults}
@@ -106,7 +119,7 @@ async def get_admin_static_page(page_id: str, token: str):
     if not await verify_admin_session(token):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
-    content = await db.static_pages.find_one({"page_id": page_id}, {"_id": 0})
+    content = await db.static_pages.find_one({"page_id": page_id}, PAGE_PROJECTION)
     if content:
         return content
     defaults = STATIC_PAGE_DEFAULTS.get(page_id, {})
@@ -118,13 +131,19 @@ async def update_static_page(page_id: str, content: dict, token: str):
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     content["page_id"] = page_id
-    content["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content["updated_at"] = datetime.now(timezone.utc)
+    
+    existing = await db.static_pages.find_one({"page_id": page_id}, PAGE_PROJECTION) or {}
+    content["search_document"] = static_search_document({**existing, **content})
     
     await db.static_pages.update_one(
         {"page_id": page_id},
         {"$set": content},
         upsert=True
     )
+    await search_index.reindex("static_pages", page_id)
+    content_versions.bump("static_pages")
+    response_cache.invalidate(("static_page", page_id))
     return {"success": True}
 
 @router.post("/admin/static-pages")
@@ -144,10 +163,14 @@ async def create_static_page(content: dict, token: str):
     
     content["page_id"] = page_id
     content["custom"] = True
-    content["created_at"] = datetime.now(timezone.utc).isoformat()
-    content["updated_at"] = datetime.now(timezone.utc).isoformat()
+    content["created_at"] = datetime.now(timezone.utc)
+    content["updated_at"] = datetime.now(timezone.utc)
+    content["search_document"] = static_search_document(content)
     
     await db.static_pages.insert_one(content)
+    await search_index.reindex("static_pages", page_id)
+    content_versions.bump("static_pages")
+    response_cache.invalidate(("static_page", page_id))
     return {"success": True, "page_id": page_id}
 
 @router.delete("/admin/static-pages/{page_id}")
@@ -164,6 +187,9 @@ async def delete_static_page(page_id: str, token: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Seite nicht gefunden")
     
+    search_index.remove("static_pages", page_id)
+    content_versions.bump("static_pages")
+    response_cache.invalidate(("static_page", page_id))
     return {"success": True}
 
 @router.post("/admin/static-pages/{page_id}/duplicate")
@@ -173,7 +199,7 @@ async def duplicate_static_page(page_id: str, token: str, new_page_id: str = Non
         raise HTTPException(status_code=401, detail="Nicht autorisiert")
     
     # Get the source page
-    source = await db.static_pages.find_one({"page_id": page_id}, {"_id": 0})
+    source = await db.static_pages.find_one({"page_id": page_id}, PAGE_PROJECTION)
     if not source:
         # Check if it's a default page
         if page_id in STATIC_PAGE_DEFAULTS:
@@ -190,9 +216,13 @@ async def duplicate_static_page(page_id: str, token: str, new_page_id: str = Non
     new_page["page_id"] = new_id
     new_page["hero_title"] = f"{source.get('hero_title', 'Neue Seite')} (Kopie)"
     new_page["custom"] = True
-    new_page["created_at"] = datetime.now(timezone.utc).isoformat()
-    new_page["updated_at"] = datetime.now(timezone.utc).isoformat()
+    new_page["created_at"] = datetime.now(timezone.utc)
+    new_page["updated_at"] = datetime.now(timezone.utc)
+    new_page["search_document"] = static_search_document(new_page)
     
     await db.static_pages.insert_one(new_page)
+    await search_index.reindex("static_pages", new_id)
+    content_versions.bump("static_pages")
+    response_cache.invalidate(("static_page", new_id))
     return {"success": True, "page_id": new_id}
 
@@ -1,32 +1,195 @@
-"""Authentication utilities"""
+"""Authentication utilities
+
+Two session modes, chosen with ``ADMIN_SESSION_MODE``:
+
+- ``db`` (default): random tokens stored in ``admin_sessions``; validated
+  tokens are cached in process until they expire.
+- ``signed``: stateless tokens ``<issued_ms>.<id>.<hmac>`` verified with
+  CPU only. Logouts and password changes are kept in a small revocation
+  set that is loaded at startup, so checks never touch the database.
+"""
+import base64
 import hashlib
+import hmac
+import os
 import secrets
 from datetime import datetime, timezone, timedelta
 from database import db
+from queries import active_session_filter, other_sessions_filter
+from utils.cache import LRUCache
 
 DEFAULT_PASSWORD = "gltz2025"
 
+SESSION_LIFETIME = timedelta(minutes=30)
+
+SESSION_MODE = os.environ.get('ADMIN_SESSION_MODE', 'db')
+
+# Validated tokens -> session expiry. Each entry lives only until its
+# session expires, so a cache hit never outlives the session.
+session_cache = LRUCache(max_entries=int(os.environ.get('ADMIN_SESSION_CACHE_SIZE', '256')))
+
 def hash_password(password: str) -> str:
     """Hash a password using SHA-256"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-async def verify_admin_session(token: str) -> bool:
-    """Verify if an admin session token is valid"""
-    session = await db.admin_sessions.find_one({"token": token, "active": True})
+# ============== Database Sessions ==============
+
+def _cache_session(token: str, expires: datetime):
+    remaining = (expires - datetime.now(timezone.utc)).total_seconds()
+    if remaining > 0:
+        session_cache.set(token, expires, ttl=remaining)
+
+async def _verify_db_session(token: str) -> bool:
+    if session_cache.get(token) is not None:
+        return True
+    session = await db.admin_sessions.find_one(active_session_filter(token))
     if not session:
         return False
-    created = datetime.fromisoformat(session['created_at'])
-    if datetime.now(timezone.utc) - created > timedelta(minutes=30):
+    expires = session['created_at'] + SESSION_LIFETIME
+    if datetime.now(timezone.utc) > expires:
         await db.admin_sessions.update_one({"token": token}, {"$set": {"active": False}})
         return False
+    _cache_session(token, expires)
     return True
 
-async def create_admin_session() -> str:
-    """Create a new admin session and return the token"""
+async def _create_db_session() -> str:
     token = secrets.token_urlsafe(32)
+    created = datetime.now(timezone.utc)
     await db.admin_sessions.insert_one({
         "token": token,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": created,
         "active": True
     })
+    _cache_session(token, created + SESSION_LIFETIME)
+    return token
+
+# ============== Signed Sessions ==============
+
+class SignedSessionState:
+    """Signing key and revocations for stateless tokens"""
+
+    def __init__(self):
+        self.secret = os.environ.get('ADMIN_TOKEN_SECRET', '').encode()
+        # token id -> issue time (ms); entries are dropped once expired
+        self.revoked = {}
+        # tokens issued before this time (ms) are invalid
+        self.not_before = 0
+
+    def sign(self, payload: str) -> str:
+        digest = hmac.new(self.secret, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def parse(self, token: str):
+        """Return (issued_ms, token_id) of a correctly signed token, else None"""
+        parts = token.split(".")
+        if len(parts) != 3 or not self.secret:
+            return None
+        issued, token_id, signature = parts
+        # isdigit() alone accepts digits int() rejects ("²"); compare_digest
+        # raises on non-ASCII str, so compare bytes
+        if not (issued.isascii() and issued.isdigit()):
+            return None
+        expected = self.sign(f"{issued}.{token_id}")
+        if not hmac.compare_digest(signature.encode(), expected.encode()):
+            return None
+        return int(issued), token_id
+
+    def prune(self, now_ms: int):
+        cutoff = now_ms - SESSION_LIFETIME.total_seconds() * 1000
+        self.revoked = {k: v for k, v in self.revoked.items() if v >= cutoff}
+
+signed_sessions = SignedSessionState()
+
+def _now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+async def load_signed_sessions():
+    """Load signing key, revocations and the not-before time at startup"""
+    state = signed_sessions
+    if not state.secret:
+        stored = await db.admin_settings.find_one({"type": "token_secret"})
+        if not stored:
+            stored = {"type": "token_secret", "secret": secrets.token_urlsafe(32)}
+            await db.admin_settings.update_one(
+                {"type": "token_secret"}, {"$setOnInsert": stored}, upsert=True
+            )
+            stored = await db.admin_settings.find_one({"type": "token_secret"})
+        state.secret = stored["secret"].encode()
+
+    now = _now_ms()
+    cutoff = now - int(SESSION_LIFETIME.total_seconds() * 1000)
+    await db.admin_revoked_tokens.delete_many({"issued_ms": {"$lt": cutoff}})
+    state.revoked = {
+        r["token_id"]: r["issued_ms"]
+        async for r in db.admin_revoked_tokens.find({}, {"_id": 0})
+    }
+    admin = await db.admin_settings.find_one({"type": "admin"}, {"_id": 0, "tokens_not_before": 1})
+    state.not_before = (admin or {}).get("tokens_not_before", 0)
+
+def _verify_signed_session(token: str) -> bool:
+    parsed = signed_sessions.parse(token)
+    if not parsed:
+        return False
+    issued, token_id = parsed
+    now = _now_ms()
+    if issued < signed_sessions.not_before or now - issued > SESSION_LIFETIME.total_seconds() * 1000:
+        return False
+    return token_id not in signed_sessions.revoked
+
+def _create_signed_session() -> str:
+    payload = f"{_now_ms()}.{secrets.token_urlsafe(12)}"
+    return f"{payload}.{signed_sessions.sign(payload)}"
+
+# ============== Public API ==============
+
+async def verify_admin_session(token: str) -> bool:
+    """Verify if an admin session token is valid"""
+    if SESSION_MODE == 'signed':
+        return _verify_signed_session(token)
+    return await _verify_db_session(token)
+
+async def create_admin_session() -> str:
+    """Create a new admin session and return the token"""
+    if SESSION_MODE == 'signed':
+        return _create_signed_session()
+    return await _create_db_session()
+
+async def end_admin_session(token: str):
+    """End a session (logout)"""
+    if SESSION_MODE == 'signed':
+        parsed = signed_sessions.parse(token)
+        if parsed:
+            issued, token_id = parsed
+            signed_sessions.prune(_now_ms())
+            signed_sessions.revoked[token_id] = issued
+            await db.admin_revoked_tokens.update_one(
+                {"token_id": token_id},
+                {"$set": {"token_id": token_id, "issued_ms": issued}},
+                upsert=True
+            )
+        return
+    session_cache.pop(token)
+    await db.admin_sessions.update_one({"token": token}, {"$set": {"active": False}})
+
+async def end_other_admin_sessions(token: str) -> str:
+    """End every session except the caller's (after a password change)
+
+    Returns the caller's token to use from now on: unchanged in ``db``
+    mode, freshly issued in ``signed`` mode, where all older tokens are
+    invalidated at once.
+    """
+    if SESSION_MODE == 'signed':
+        now = _now_ms()
+        signed_sessions.not_before = now
+        await db.admin_settings.update_one(
+            {"type": "admin"}, {"$set": {"tokens_not_before": now, "type": "admin"}}, upsert=True
+        )
+        return _create_signed_session()
+    expires = session_cache.get(token)
+    session_cache.clear()
+    await db.admin_sessions.update_many(
+        other_sessions_filter(token), {"$set": {"active": False}}
+    )
+    if expires is not None:
+        _cache_session(token, expires)
     return token
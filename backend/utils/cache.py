@@ -0,0 +1,226 @@
+"""In-process caching helpers
+
+``LRUCache`` is a bounded least-recently-used map with optional expiry and
+hit/miss counters. ``content_versions`` holds one counter per content
+scope ("blog", "pages", ...); admin write routes bump the scope they
+change, and caches include the versions they depend on in their keys, so
+a write makes every dependent entry unreachable without tracking them.
+``ResponseCache`` keeps serialized JSON bodies of public read routes;
+admin writes drop the keys they change.
+``SingleFlight`` lets concurrent identical reads share one load and serves
+the last loaded value while the database is unavailable.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from utils.circuit_breaker import DatabaseUnavailable
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """Bounded LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is None or expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value; ``ttl`` overrides the cache-wide expiry"""
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ContentVersions:
+    """Monotonic change counters per content scope"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._listeners = []
+
+    def get(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def subscribe(self, listener):
+        """Call ``listener(scopes)`` after every bump"""
+        self._listeners.append(listener)
+
+    def bump(self, *scopes: str):
+        """Record a write to the given scopes"""
+        for scope in scopes:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+        for listener in self._listeners:
+            listener(scopes)
+
+    def key(self, *scopes: str) -> Tuple[int, ...]:
+        """Current versions of several scopes, for use in cache keys"""
+        return tuple(self._versions.get(scope, 0) for scope in scopes)
+
+
+content_versions = ContentVersions()
+
+
+def render_json(content: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+        indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class ResponseCache:
+    """Serialized response bodies, dropped by key on writes"""
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = None):
+        self._bodies = LRUCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        return self._bodies.get(key)
+
+    def put(self, key: Hashable, content: Any) -> bytes:
+        """Serialize and store content; returns the body"""
+        body = render_json(content)
+        self._bodies.set(key, body)
+        return body
+
+    def invalidate(self, *keys: Hashable):
+        for key in keys:
+            self._bodies.pop(key)
+
+
+class SingleFlight:
+    """Coalesced loads with stale-if-error
+
+    ``get(key, loader, version)`` returns the stored value while its
+    ``version`` matches and it is younger than ``ttl`` (or than
+    ``ttl_for(value)`` seconds, for values that know when they go out of
+    date; None means no expiry). Otherwise one ``loader()`` call per key
+    and version is started and shared by every concurrent caller, and
+    they all wait for it: after a write the stored value may be deleted or
+    unpublished content. A refresh that fails with ``DatabaseUnavailable``
+    keeps the previous value; any other error drops it.
+
+    With a ``breaker`` (``utils.circuit_breaker``) loads run under its
+    deadline, and a caller whose load fails with ``DatabaseUnavailable``
+    gets the previous value of any age instead, as long as no write has
+    changed its version since.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None, breaker=None,
+                 ttl_for: Optional[Callable[[Any], Optional[float]]] = None):
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.breaker = breaker
+        self._values = LRUCache(max_entries=max_entries)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader, version: Hashable = None) -> Any:
+        entry = self._values.get(key)
+        current = entry is not None and entry[1] == version
+        if current:
+            value, _, expires = entry
+            if expires is None or time.monotonic() < expires:
+                return value
+        task = self._refresh(key, loader, version)
+        try:
+            # Shielded: a disconnecting client must not cancel the shared load
+            return await asyncio.shield(task)
+        except DatabaseUnavailable:
+            if not current:
+                raise
+            return value
+
+    def _refresh(self, key: Hashable, loader, version: Hashable) -> asyncio.Task:
+        # A load started before a write may have read the old content
+        task = self._inflight.get((key, version))
+        if task is not None:
+            return task
+        load = self.breaker.call(loader) if self.breaker is not None else loader()
+        task = asyncio.get_running_loop().create_task(self._load(key, load, version))
+        task.add_done_callback(self._log_failure)
+        self._inflight[(key, version)] = task
+        return task
+
+    async def _load(self, key: Hashable, load, version: Hashable) -> Any:
+        try:
+            value = await load
+        except DatabaseUnavailable:
+            raise
+        except Exception:
+            # The database answered, the previous value is no longer valid
+            self._values.pop(key)
+            raise
+        else:
+            ttl = self.ttl_for(value) if self.ttl_for is not None else self.ttl
+            expires = time.monotonic() + ttl if ttl is not None else None
+            self._values.set(key, (value, version, expires))
+            return value
+        finally:
+            self._inflight.pop((key, version), None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if task.cancelled() or task.exception() is None:
+            return
+        # Outages are logged once by the breaker; HTTP errors are answers
+        level = logging.DEBUG if isinstance(task.exception(), (DatabaseUnavailable, HTTPException)) else logging.WARNING
+        logger.log(level, "Single-flight load failed: %r", task.exception())
+
+
+def json_body_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+# Public read routes: settings, legal texts, static pages
+response_cache = ResponseCache(max_entries=int(os.environ.get('RESPONSE_CACHE_SIZE', '512')))
@@ -0,0 +1,116 @@
+"""Circuit breaker and deadlines for database reads
+
+``db_breaker.call(loader)`` runs a public read under a deadline of
+``DB_QUERY_TIMEOUT_MS``: ``pymongo.timeout`` makes the driver abort
+server selection and sends ``maxTimeMS`` with each command, and the
+caller stops waiting at the same deadline. Timeouts and connection errors
+count as failures; after ``DB_BREAKER_THRESHOLD`` in a row the breaker
+opens and calls fail at once for ``DB_BREAKER_RESET_SECONDS``. Then a
+single probe call is let through; its success closes the breaker again.
+
+Failures surface as ``DatabaseUnavailable``. ``SingleFlight`` answers
+them with the last value it loaded; without one, ``main.py`` turns them
+into ``503 Service Unavailable``.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict
+
+import pymongo
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_TIMEOUT_MS = float(os.environ.get('DB_QUERY_TIMEOUT_MS', '2000'))
+DB_BREAKER_THRESHOLD = int(os.environ.get('DB_BREAKER_THRESHOLD', '5'))
+DB_BREAKER_RESET_SECONDS = float(os.environ.get('DB_BREAKER_RESET_SECONDS', '30'))
+
+
+class DatabaseUnavailable(Exception):
+    """The database failed, timed out, or the breaker is open"""
+
+
+def _is_outage(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionFailure, ExecutionTimeout)):
+        return True
+    return isinstance(exc, PyMongoError) and exc.timeout
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe -> closed"""
+
+    def __init__(self, name: str, threshold: int = DB_BREAKER_THRESHOLD,
+                 reset_seconds: float = DB_BREAKER_RESET_SECONDS,
+                 timeout_ms: float = DB_QUERY_TIMEOUT_MS):
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.timeout = timeout_ms / 1000
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            # This caller probes; others keep failing fast until it returns
+            self.state = "half_open"
+            return True
+        return False
+
+    def _record(self, ok: bool):
+        if ok:
+            if self.state != "closed":
+                logger.info("Circuit %s closed", self.name)
+            self.state = "closed"
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                logger.warning("Circuit %s open after %d failures", self.name, self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def call(self, loader) -> Any:
+        """Await ``loader()`` under the deadline, or fail fast while open"""
+        if not self._allow():
+            self.rejected += 1
+            raise DatabaseUnavailable(f"{self.name}: circuit open")
+        try:
+            with pymongo.timeout(self.timeout):
+                result = await asyncio.wait_for(loader(), self.timeout)
+        except asyncio.CancelledError:
+            if self.state == "half_open":
+                self.state = "open"
+            raise
+        except Exception as exc:
+            if _is_outage(exc):
+                if isinstance(exc, asyncio.TimeoutError):
+                    self.timeouts += 1
+                self._record(False)
+                raise DatabaseUnavailable(f"{self.name}: {exc!r}") from exc
+            # Any other outcome (404, validation error) means the database answered
+            self._record(True)
+            raise
+        self._record(True)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "timeout_ms": self.timeout * 1000,
+            "threshold": self.threshold,
+            "reset_seconds": self.reset_seconds,
+        }
+
+
+db_breaker = CircuitBreaker("mongodb")
@@ -0,0 +1,96 @@
+"""HTTP validators and Cache-Control for public content routes
+
+ETags are derived from ``content_versions`` (bumped by every admin write
+to a scope) plus a per-process boot id, so they are known before the
+database is queried or a body is serialized, and never collide with tags
+issued before a restart. A matching ``If-None-Match`` is answered with
+``304 Not Modified`` right away.
+
+``Cache-Control`` is set per route from ``CACHE_POLICIES``; each entry
+can be overridden with ``CACHE_CONTROL_<NAME>`` (e.g.
+``CACHE_CONTROL_BLOG="public, max-age=0, must-revalidate"``).
+"""
+import hashlib
+import os
+import re
+import secrets
+from typing import Optional
+
+from fastapi import Request, Response
+
+from utils.cache import content_versions
+
+BOOT_ID = secrets.token_hex(4)
+
+DEFAULT_CACHE_POLICIES = {
+    "settings": "public, max-age=60, stale-while-revalidate=600",
+    "landing": "public, max-age=60, stale-while-revalidate=600",
+    "static_pages": "public, max-age=60, stale-while-revalidate=600",
+    "blog": "public, max-age=30, stale-while-revalidate=300",
+    "gallery": "public, max-age=60, stale-while-revalidate=600",
+    # Short: items appear and disappear with their start/end dates
+    "news": "public, max-age=30, stale-while-revalidate=60",
+    "home": "public, max-age=30, stale-while-revalidate=60",
+}
+
+CACHE_POLICIES = {
+    name: os.environ.get(f'CACHE_CONTROL_{name.upper()}', policy)
+    for name, policy in DEFAULT_CACHE_POLICIES.items()
+}
+
+
+def content_etag(scope: str, *extra) -> str:
+    """Strong ETag for the current version of a content scope"""
+    tag = f"{BOOT_ID}-{scope}-{content_versions.get(scope)}"
+    if extra:
+        digest = hashlib.sha1(repr(extra).encode()).hexdigest()[:12]
+        tag = f"{tag}-{digest}"
+    return f'"{tag}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether ``Accept-Encoding`` allows gzip (``q=0`` refuses it)"""
+    weights = {}
+    for entry in (accept_encoding or "").split(","):
+        coding, *params = [part.strip() for part in entry.split(";")]
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.lower()] = weight
+    # An explicit gzip entry wins over the wildcard
+    weight = weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0)))
+    return weight > 0
+
+
+def set_cache_headers(response: Response, etag: str, policy: str, max_age: Optional[int] = None) -> Response:
+    """``max_age`` lowers the policy's max-age, e.g. to the next scheduled change"""
+    control = CACHE_POLICIES[policy]
+    if max_age is not None:
+        control = re.sub(r"max-age=(\d+)", lambda m: f"max-age={min(int(m.group(1)), max_age)}", control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = control
+    return response
+
+
+def not_modified(request: Request, etag: str, policy: str) -> Optional[Response]:
+    """A 304 response if the client already has this version, else None"""
+    if _matches(request.headers.get("if-none-match"), etag):
+        return set_cache_headers(Response(status_code=304), etag, policy)
+    return None
+
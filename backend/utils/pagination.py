@@ -0,0 +1,91 @@
+"""Keyset (cursor) pagination for list routes
+
+A list is sorted by its route's sort key plus ``id`` as tiebreaker. A page
+holds up to ``limit`` documents. If more follow, the response carries an
+opaque cursor in the ``X-Next-Cursor`` header that encodes the sort
+values of the last document. Passing it back as ``cursor=`` continues
+with a range filter on the sort key, so every page is one index range
+scan however deep the client pages, instead of a growing ``skip``.
+
+Bodies stay plain JSON arrays, so clients that ignore the header get the
+first page as before.
+"""
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from bson.json_util import JSONOptions
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 500
+
+_JSON_OPTIONS = JSONOptions(tz_aware=True)
+
+# Sort values a cursor may carry; documents or arrays would become
+# operator expressions inside the range filter
+_CURSOR_TYPES = (type(None), bool, int, float, str, ObjectId, datetime)
+
+
+def page_size(limit: int, maximum: int = MAX_PAGE_SIZE) -> int:
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(values: list) -> str:
+    raw = json_util.dumps(values, json_options=_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json_util.loads(raw, json_options=_JSON_OPTIONS)
+    except Exception:
+        values = None
+    if (not isinstance(values, list) or len(values) != length
+            or not all(isinstance(value, _CURSOR_TYPES) for value in values)):
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor")
+    return values
+
+
+def _after(field: str, direction: int, value) -> Optional[dict]:
+    """Documents strictly after ``value`` on one key (null sorts first)"""
+    if direction == 1:
+        return {field: {"$ne": None}} if value is None else {field: {"$gt": value}}
+    if value is None:
+        return None
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: list) -> dict:
+    """Filter for the documents after ``values`` in ``sort`` order"""
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        after = _after(field, direction, values[i])
+        if after is None:
+            continue
+        ties = {prev: values[j] for j, (prev, _) in enumerate(sort[:i])}
+        branches.append({"$and": [ties, after]} if ties else after)
+    # The ascending ``id`` tiebreaker always contributes a branch
+    return {"$or": branches}
+
+
+async def fetch_page(collection, query: dict, sort: List[Tuple[str, int]], limit: int,
+                     cursor: Optional[str] = None, projection: Optional[dict] = None) -> Tuple[list, Optional[str]]:
+    """One page of ``collection.find(query)`` in ``sort`` order, plus the next cursor"""
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+    projection = {"_id": 0} if projection is None else projection
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor([last.get(field) for field, _ in sort])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,36 @@
+"""Field selection for list routes
+
+``view=summary`` leaves out the body fields (``content``), which list
+views never render; ``fields=title,excerpt`` returns only the listed
+fields. Either way the selection becomes the MongoDB projection, so the
+omitted fields are neither transferred from the database nor serialized.
+``id`` and the sort keys are always returned, cursor pagination needs
+them.
+"""
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+VIEWS = ("full", "summary")
+
+
+def list_projection(model: type[BaseModel], view: Optional[str] = None, fields: Optional[str] = None,
+                    always: Iterable[str] = ("id",), body_fields: Iterable[str] = ("content",)) -> Optional[dict]:
+    """MongoDB projection for the requested view, or None for full documents"""
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in model.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unbekannte Felder: {', '.join(unknown)}")
+        return {"_id": 0, **{name: 1 for name in (*always, *names)}}
+    if view in (None, "full"):
+        return None
+    if view == "summary":
+        return {"_id": 0, **{name: 0 for name in body_fields}}
+    raise HTTPException(status_code=400, detail=f"Unbekannte Ansicht (erlaubt: {', '.join(VIEWS)})")
+
+
+def projection_key(projection: Optional[dict]) -> Optional[tuple]:
+    """Hashable form of a projection, for cache keys"""
+    return tuple(sorted(projection.items())) if projection else None
@@ -0,0 +1,167 @@
+"""MongoDB command monitoring per API route
+
+``QueryMetrics`` is a pymongo ``CommandListener`` registered on the client
+in ``database.py``. Each command is tagged with the route that issued it
+(``current_route``, set per request in ``main.py``; Motor copies the
+context into its executor threads) and recorded with its duration,
+returned documents and, with ``QUERY_METRICS_REPLY_BYTES=1``, reply size
+(measuring it re-encodes every reply, so it is off by default). Commands
+slower than ``SLOW_QUERY_MS`` are logged with their filter and sort.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import bson
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+QUERY_METRICS_REPLY_BYTES = os.environ.get('QUERY_METRICS_REPLY_BYTES', '0') not in ('0', 'false', 'False')
+
+# Durations kept per route for the percentiles
+SAMPLES_PER_ROUTE = 1000
+SLOW_QUERY_LOG_SIZE = 100
+
+current_route: ContextVar[str] = ContextVar("current_route", default="(no route)")
+
+# Commands that only maintain the connection
+IGNORED_COMMANDS = frozenset({"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue"})
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _shape(command: dict) -> Dict[str, Any]:
+    """Collection, filter and sort of a command, for the slow-query log"""
+    name = next(iter(command), "")
+    shape = {"collection": command.get(name) if isinstance(command.get(name), str) else None}
+    if "filter" in command:
+        shape["filter"] = command["filter"]
+    elif "query" in command:
+        shape["filter"] = command["query"]
+    elif command.get("updates"):
+        shape["filter"] = command["updates"][0].get("q")
+    elif command.get("deletes"):
+        shape["filter"] = command["deletes"][0].get("q")
+    elif "pipeline" in command:
+        shape["pipeline"] = command["pipeline"]
+    if "sort" in command:
+        shape["sort"] = command["sort"]
+    return shape
+
+
+def _returned_docs(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+    return reply.get("n", 0)
+
+
+class RouteStats:
+    """Counters and recent durations of one route"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.docs = 0
+        self.bytes = 0
+        self.durations = deque(maxlen=SAMPLES_PER_ROUTE)
+
+    def summary(self, reply_bytes: bool = False) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+        summary = {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "docs_returned": self.docs,
+            "p50_ms": round(_percentile(ordered, 0.50), 3),
+            "p95_ms": round(_percentile(ordered, 0.95), 3),
+            "p99_ms": round(_percentile(ordered, 0.99), 3),
+        }
+        if reply_bytes:
+            summary["reply_bytes"] = self.bytes
+        return summary
+
+
+class QueryMetrics(monitoring.CommandListener):
+    """Aggregates command timings per route; thread-safe"""
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, reply_bytes: bool = QUERY_METRICS_REPLY_BYTES):
+        self.slow_query_ms = slow_query_ms
+        self.reply_bytes = reply_bytes
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, tuple] = {}
+        self._routes: Dict[str, RouteStats] = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        shape = _shape(event.command)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (current_route.get(), shape)
+
+    def succeeded(self, event):
+        self._finish(event, event.reply)
+
+    def failed(self, event):
+        self._finish(event, None)
+
+    def _finish(self, event, reply: Optional[dict]):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        route, shape = pending
+        duration_ms = event.duration_micros / 1000
+        docs = _returned_docs(reply) if reply else 0
+        size = len(bson.encode(reply)) if reply and self.reply_bytes else 0
+
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats()
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.docs += docs
+            stats.bytes += size
+            stats.durations.append(duration_ms)
+
+        if duration_ms >= self.slow_query_ms:
+            self.slow_queries.append({
+                "route": route,
+                "command": event.command_name,
+                "collection": shape["collection"],
+                "duration_ms": round(duration_ms, 3),
+                "docs_returned": docs,
+                "failed": reply is None,
+                "at": time.time(),
+                **{key: repr(shape[key]) for key in ("filter", "sort", "pipeline") if key in shape},
+            })
+            logger.warning("Slow query %s %s on %s: %.1f ms filter=%s sort=%s",
+                           route, event.command_name, shape.get("collection"),
+                           duration_ms, shape.get("filter"), shape.get("sort"))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-route aggregates, slowest total first, plus recent slow queries"""
+        with self._lock:
+            routes = {route: stats.summary(self.reply_bytes) for route, stats in self._routes.items()}
+            slow = list(self.slow_queries)
+        ordered = dict(sorted(routes.items(), key=lambda item: -item[1]["total_ms"]))
+        return {"slow_query_ms": self.slow_query_ms, "routes": ordered, "slow_queries": slow}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self.slow_queries.clear()
+
+
+query_metrics = QueryMetrics()
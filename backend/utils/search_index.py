@@ -0,0 +1,467 @@
+"""In-memory inverted index for the site search
+
+The index maps every token to the documents containing it, so a query only
+touches the postings of its own terms instead of scanning the collections.
+It is built once at startup and kept current by the admin write routes,
+which call ``search_index.reindex(kind, doc_id)`` after every change.
+
+Text is run through the German analyzer in ``utils.text_analysis`` when a
+document is indexed, so postings hold normalized, stemmed terms and a
+query only needs to analyze its own few words.
+
+Matches are ranked with BM25F: term frequencies are weighted per field
+(a hit in the title counts more than one in the body) and only the best
+``offset + limit`` results per group are selected with a bounded heap.
+
+Title, tag and heading terms also feed a trigram index; in fuzzy mode a
+query term additionally matches vocabulary within a small edit distance.
+Titles, blog categories and gallery tags are mirrored into the prefix
+structure behind ``/api/search/suggest``.
+
+Results are compact (id, title, path and a few display fields) with a
+highlighted snippet. Snippets are cut from a plain-text copy of each
+document using the term offsets recorded at index time, so building them
+never re-scans the content.
+"""
+import bisect
+import heapq
+import math
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from database import db
+from utils.text_analysis import analyze, analyze_spans, strip_html, SPLIT_COMPOUNDS
+from utils.suggest_index import SuggestionIndex
+from utils.trigram_index import TrigramIndex
+
+# Searchable fields and their BM25F weights
+FIELD_WEIGHTS = {"title": 4.0, "tags": 2.0, "excerpt": 1.5, "content": 1.0}
+FIELDS = tuple(FIELD_WEIGHTS)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fields whose terms are eligible for fuzzy matching, and the score factor
+# applied to documents that only match through a typo correction
+FUZZY_FIELDS = ("title", "tags")
+FUZZY_WEIGHT = 0.6
+
+# Snippet window length and the context kept before the first hit (chars)
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 40
+
+# Static page defaults for search
+STATIC_PAGE_DEFAULTS_SEARCH = [
+    {"page_id": "schwangerschaft", "title": "Schwangerschaft", "hero_title": "Zwillings-Schwangerschaft", "hero_description": "Eine Zwillingsschwangerschaft ist besonders", "path": "/schwangerschaft"},
+    {"page_id": "baby-alltag", "title": "Baby-Alltag", "hero_title": "Leben mit Zwillingen", "hero_description": "Der Alltag mit zwei Babys ist intensiv", "path": "/baby-alltag"},
+    {"page_id": "tipps", "title": "Tipps & Tricks", "hero_title": "Praktische Ratschläge", "hero_description": "Gesammelte Weisheiten aus unserem Alltag", "path": "/tipps"},
+    {"page_id": "reisen", "title": "Reisen", "hero_title": "Unterwegs mit Zwillingen", "hero_description": "Reisen mit zwei kleinen Kindern", "path": "/reisen"},
+    {"page_id": "ueber-uns", "title": "Über uns", "hero_title": "Unsere Geschichte", "hero_description": "Wir sind eine junge Familie", "path": "/ueber-uns"},
+    {"page_id": "spende", "title": "Spende", "hero_title": "Projekt unterstützen", "hero_description": "Mit deiner Unterstützung", "path": "/spende"},
+]
+STATIC_DEFAULTS_BY_ID = {p["page_id"]: p for p in STATIC_PAGE_DEFAULTS_SEARCH}
+
+# Result groups returned by /api/search, in response order
+SEARCH_KINDS = ("pages", "posts", "gallery", "static_pages")
+
+DocKey = Tuple[str, str]
+
+
+# ============== Document Builders ==============
+# Each builder turns a stored document into an IndexedDocument, or None if
+# the document must not be searchable (drafts, trash).
+
+class IndexedDocument(NamedTuple):
+    fields: Dict[str, str]              # field name -> text, see FIELD_WEIGHTS
+    result: dict                        # compact payload returned by /api/search
+    suggestions: List[Tuple[str, str, str]] = []  # (type, label, path) for autocomplete
+    snippet_text: str = ""              # plain text the snippet is cut from
+
+
+def _page_document(page: dict) -> Optional[IndexedDocument]:
+    if page.get("status") != "live":
+        return None
+    content = strip_html(page.get("content", ""))
+    path = f"/{page.get('slug', '')}"
+    return IndexedDocument(
+        fields={
+            "title": page.get("title", ""),
+            "tags": page.get("slug", ""),
+            "content": content,
+        },
+        result={"id": page.get("id"), "title": page.get("title", ""), "path": path},
+        suggestions=[("page", page.get("title", ""), path)],
+        snippet_text=content,
+    )
+
+
+def _post_document(post: dict) -> Optional[IndexedDocument]:
+    if post.get("status") != "live":
+        return None
+    excerpt = post.get("excerpt", "")
+    content = strip_html(post.get("content", ""))
+    path = f"/blog/{post.get('id', '')}"
+    return IndexedDocument(
+        fields={
+            "title": post.get("title", ""),
+            "tags": post.get("category", ""),
+            "excerpt": excerpt,
+            "content": content,
+        },
+        result={
+            "id": post.get("id"),
+            "title": post.get("title", ""),
+            "path": path,
+            "category": post.get("category", ""),
+            "image_url": post.get("image_url"),
+        },
+        suggestions=[
+            ("post", post.get("title", ""), path),
+            ("category", post.get("category", ""), ""),
+        ],
+        snippet_text=f"{excerpt} {content}".strip(),
+    )
+
+
+def _gallery_document(image: dict) -> Optional[IndexedDocument]:
+    tags = image.get("tags", [])
+    return IndexedDocument(
+        fields={
+            "title": image.get("title", ""),
+            "tags": " ".join(tags),
+        },
+        result={
+            "id": image.get("id"),
+            "title": image.get("title", ""),
+            "path": "/twins-art",
+            "url": image.get("url"),
+        },
+        suggestions=[("tag", tag, "") for tag in tags],
+        snippet_text=" ".join(part for part in [image.get("alt", ""), image.get("caption", ""), ", ".join(tags)] if part),
+    )
+
+
+def _text(value) -> str:
+    """Static page content is free-form: anything but a string counts as empty"""
+    return value if isinstance(value, str) else ""
+
+
+def _flatten(parts: list) -> str:
+    return " ".join(" ".join(_text(part) for part in parts).split())
+
+
+def static_search_document(page: dict) -> dict:
+    """Flattened search document of a static page
+
+    Computed once when the page is written and stored with it as
+    ``search_document``; the index reads only this blob.
+    """
+    page = {**STATIC_DEFAULTS_BY_ID.get(page.get("page_id"), {}), **page}
+    headings = [page.get("hero_label")]
+    parts = []
+    for section in page.get("sections") or []:
+        if not isinstance(section, dict):
+            continue
+        headings.append(section.get("title"))
+        parts.extend([section.get("description"), section.get("subtitle")])
+        for item in section.get("items") or []:
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, dict):
+                parts.extend([item.get("title"), item.get("content")])
+    return {
+        "title": _text(page.get("hero_title")) or _text(page.get("title")),
+        "description": _text(page.get("hero_description")),
+        "path": _text(page.get("path")) or f"/{_text(page.get('page_id'))}",
+        "fields": {
+            "title": _flatten([page.get("title"), page.get("hero_title")]),
+            "tags": _flatten(headings),
+            "excerpt": _flatten([page.get("hero_description")]),
+            "content": _flatten(parts),
+        },
+    }
+
+
+def _static_page_document(page: dict) -> Optional[IndexedDocument]:
+    blob = page.get("search_document") or static_search_document(page)
+    fields = blob["fields"]
+    return IndexedDocument(
+        fields=fields,
+        result={
+            "page_id": page.get("page_id"),
+            "title": blob["title"],
+            "description": blob["description"],
+            "path": blob["path"],
+        },
+        suggestions=[("static_page", blob["title"], blob["path"])],
+        snippet_text=f"{fields['excerpt']} {fields['content']}".strip(),
+    )
+
+
+# kind -> (collection name, id field, projection, builder)
+_SOURCES = {
+    "pages": ("pages", "id", {"_id": 0}, _page_document),
+    "posts": ("blog_posts", "id", {"_id": 0}, _post_document),
+    "gallery": ("gallery_images", "id", {"_id": 0}, _gallery_document),
+    "static_pages": ("static_pages", "page_id", {"_id": 0, "page_id": 1, "search_document": 1}, _static_page_document),
+}
+
+
+# ============== Inverted Index ==============
+
+class SearchIndex:
+    """Token -> document postings with a sorted vocabulary for prefix lookups"""
+
+    def __init__(self):
+        # term -> {doc key: per-field term frequencies (aligned with FIELDS)}
+        self._postings: Dict[str, Dict[DocKey, Tuple[int, ...]]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_terms: Dict[DocKey, List[str]] = {}
+        self._doc_fuzzy_terms: Dict[DocKey, List[str]] = {}
+        self._trigrams = TrigramIndex()
+        self._suggestions = SuggestionIndex()
+        self._doc_lengths: Dict[DocKey, Tuple[int, ...]] = {}
+        self._total_lengths = [0] * len(FIELDS)
+        self._docs: Dict[DocKey, dict] = {}
+        # doc key -> (snippet text, {term: [(start, end), ...]})
+        self._snippets: Dict[DocKey, Tuple[str, Dict[str, List[Tuple[int, int]]]]] = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, kind: str, doc_id: str, doc: IndexedDocument):
+        """Index (or re-index) a document under the given result group"""
+        key = (kind, doc_id)
+        self.remove(kind, doc_id)
+        fields = doc.fields
+
+        counts: Dict[str, List[int]] = {}
+        lengths = []
+        for i, field in enumerate(FIELDS):
+            tokens = analyze(fields.get(field, ""), split_compounds=SPLIT_COMPOUNDS)
+            lengths.append(len(tokens))
+            for token in tokens:
+                counts.setdefault(token, [0] * len(FIELDS))[i] += 1
+
+        for term, tfs in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            postings[key] = tuple(tfs)
+
+        fuzzy_fields = [FIELDS.index(field) for field in FUZZY_FIELDS]
+        fuzzy_terms = [term for term, tfs in counts.items() if any(tfs[i] for i in fuzzy_fields)]
+        self._trigrams.add(fuzzy_terms)
+
+        self._doc_terms[key] = list(counts)
+        self._doc_fuzzy_terms[key] = fuzzy_terms
+        self._doc_lengths[key] = tuple(lengths)
+        for i, length in enumerate(lengths):
+            self._total_lengths[i] += length
+        self._docs[key] = doc.result
+        self._suggestions.set(key, list(doc.suggestions))
+
+        text = unicodedata.normalize("NFKC", doc.snippet_text)
+        offsets: Dict[str, List[Tuple[int, int]]] = {}
+        for term, start, end in analyze_spans(text, split_compounds=SPLIT_COMPOUNDS):
+            offsets.setdefault(term, []).append((start, end))
+        self._snippets[key] = (text, offsets)
+
+    def remove(self, kind: str, doc_id: str):
+        """Drop a document and any terms left without postings"""
+        key = (kind, doc_id)
+        for term in self._doc_terms.pop(key, []):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                pos = bisect.bisect_left(self._vocabulary, term)
+                del self._vocabulary[pos]
+        self._trigrams.remove(self._doc_fuzzy_terms.pop(key, []))
+        self._suggestions.discard(key)
+        for i, length in enumerate(self._doc_lengths.pop(key, ())):
+            self._total_lengths[i] -= length
+        self._docs.pop(key, None)
+        self._snippets.pop(key, None)
+
+    def _expand(self, token: str) -> List[str]:
+        """All indexed terms starting with token (exact match included)"""
+        start = bisect.bisect_left(self._vocabulary, token)
+        end = bisect.bisect_left(self._vocabulary, token + "\uffff", lo=start)
+        return self._vocabulary[start:end]
+
+    def _score_terms(self, terms: List[str]) -> Dict[DocKey, float]:
+        """BM25F score of every document containing any of the terms
+
+        The terms are scored as one pseudo-term (summed frequencies, shared
+        idf) so a rare prefix expansion cannot outrank an exact hit through
+        its higher idf.
+        """
+        merged: Dict[DocKey, List[int]] = {}
+        for term in terms:
+            for key, tfs in self._postings[term].items():
+                acc = merged.get(key)
+                if acc is None:
+                    merged[key] = list(tfs)
+                else:
+                    for i, tf in enumerate(tfs):
+                        acc[i] += tf
+        if not merged:
+            return {}
+
+        n_docs = len(self._docs)
+        df = len(merged)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        avg_lengths = [max(total / n_docs, 1.0) for total in self._total_lengths]
+        scores: Dict[DocKey, float] = {}
+        for key, tfs in merged.items():
+            lengths = self._doc_lengths[key]
+            weighted_tf = 0.0
+            for i, tf in enumerate(tfs):
+                if tf:
+                    norm = 1 - BM25_B + BM25_B * lengths[i] / avg_lengths[i]
+                    weighted_tf += FIELD_WEIGHTS[FIELDS[i]] * tf / norm
+            scores[key] = idf * weighted_tf / (BM25_K1 + weighted_tf)
+        return scores
+
+    def _token_scores(self, token: str, fuzzy: bool = False) -> Tuple[Dict[DocKey, float], List[str]]:
+        """Scores of the documents matching one query token, and the terms matched
+
+        The token matches every indexed term it is a prefix of; in fuzzy
+        mode also title/tag terms within a bounded edit distance, at a
+        reduced weight.
+        """
+        terms = self._expand(token)
+        scores = self._score_terms(terms)
+        if fuzzy:
+            exact = set(terms)
+            corrections = [term for term in self._trigrams.similar(token) if term not in exact]
+            for key, score in self._score_terms(corrections).items():
+                score *= FUZZY_WEIGHT
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+            terms = terms + corrections
+        return scores, terms
+
+    def _snippet(self, key: DocKey, terms: set) -> Tuple[str, List[Tuple[int, int]]]:
+        """Best ``SNIPPET_LENGTH`` window of the document around the matched terms
+
+        Returns the snippet and the (start, end) offsets of the matches
+        inside it. Uses the offsets recorded at index time only.
+        """
+        text, offsets = self._snippets.get(key, ("", {}))
+        if not text:
+            return "", []
+        spans = sorted({span for term in terms for span in offsets.get(term, ())})
+
+        start = 0
+        if spans:
+            # Window starting at the hit that is followed by the most hits
+            best, best_count, j = 0, 0, 0
+            for i, (hit_start, _) in enumerate(spans):
+                j = max(j, i)
+                while j < len(spans) and spans[j][1] <= hit_start + SNIPPET_LENGTH - SNIPPET_CONTEXT:
+                    j += 1
+                if j - i > best_count:
+                    best, best_count = i, j - i
+            start = max(spans[best][0] - SNIPPET_CONTEXT, 0)
+            start = min(start, max(len(text) - SNIPPET_LENGTH, 0))
+            if start:
+                space = text.find(" ", start, spans[best][0])
+                start = space + 1 if space != -1 else spans[best][0]
+        end = min(start + SNIPPET_LENGTH, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space
+
+        prefix = "…" if start else ""
+        suffix = "…" if end < len(text) else ""
+        shift = len(prefix) - start
+        highlights = [(s + shift, e + shift) for s, e in spans if s >= start and e <= end]
+        return f"{prefix}{text[start:end]}{suffix}", highlights
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, fuzzy: bool = False) -> Dict[str, object]:
+        """Return the best documents matching every query token, grouped by kind
+
+        Each group holds at most ``limit`` results starting at ``offset``;
+        ``total`` reports the full number of matches per group. ``fuzzy``
+        tolerates typos in title, tag and heading words.
+        """
+        results = {kind: [] for kind in SEARCH_KINDS}
+        results["total"] = {kind: 0 for kind in SEARCH_KINDS}
+        tokens = sorted(set(analyze(query)))
+        if not tokens or not self._docs:
+            return results
+
+        matched = [self._token_scores(t, fuzzy) for t in tokens]
+        matched_terms = {term for _, terms in matched for term in terms}
+
+        scores = None
+        for token_scores in sorted((token_scores for token_scores, _ in matched), key=len):
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {key: score + token_scores[key] for key, score in scores.items() if key in token_scores}
+            if not scores:
+                return results
+
+        grouped: Dict[str, List[Tuple[float, DocKey]]] = {kind: [] for kind in SEARCH_KINDS}
+        for key, score in scores.items():
+            grouped[key[0]].append((score, key))
+
+        for kind, matches in grouped.items():
+            results["total"][kind] = len(matches)
+            top = heapq.nlargest(offset + limit, matches)
+            for _, key in top[offset:]:
+                snippet, highlights = self._snippet(key, matched_terms)
+                results[kind].append({**self._docs[key], "snippet": snippet, "highlights": highlights})
+        return results
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        """Autocomplete suggestions for a partially typed query"""
+        return self._suggestions.suggest(prefix, limit)
+
+    # ============== Database Sync ==============
+
+    def _index_doc(self, kind: str, doc: dict):
+        _, id_field, _, builder = _SOURCES[kind]
+        indexed = builder(doc)
+        if indexed is None:
+            self.remove(kind, doc[id_field])
+        else:
+            self.add(kind, doc[id_field], indexed)
+
+    async def build(self):
+        """(Re)build the whole index from the database"""
+        self.clear()
+        for page in STATIC_PAGE_DEFAULTS_SEARCH:
+            self._index_doc("static_pages", page)
+        for kind, (collection, _, projection, _) in _SOURCES.items():
+            async for doc in db[collection].find({}, projection):
+                self._index_doc(kind, doc)
+        await self._backfill_static_documents()
+
+    async def _backfill_static_documents(self):
+        """Store search documents for static pages written before they existed"""
+        async for page in db.static_pages.find({"search_document": {"$exists": False}}, {"_id": 0}):
+            blob = static_search_document(page)
+            await db.static_pages.update_one({"page_id": page["page_id"]}, {"$set": {"search_document": blob}})
+            self._index_doc("static_pages", {"page_id": page["page_id"], "search_document": blob})
+
+    async def reindex(self, kind: str, doc_id: str):
+        """Refresh one document after an admin write (create/update/delete)"""
+        collection, id_field, projection, _ = _SOURCES[kind]
+        doc = await db[collection].find_one({id_field: doc_id}, projection)
+        if doc is None and kind == "static_pages" and doc_id in STATIC_DEFAULTS_BY_ID:
+            doc = STATIC_DEFAULTS_BY_ID[doc_id]
+        if doc is None:
+            self.remove(kind, doc_id)
+        else:
+            self._index_doc(kind, doc)
+
+
+search_index = SearchIndex()
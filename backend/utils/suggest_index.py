@@ -0,0 +1,79 @@
+"""Prefix index for search-as-you-type suggestions
+
+Suggestions (titles, blog categories, gallery tags) live in one sorted
+array keyed by their folded text, with an extra key for every word start,
+so "rout" completes "Schlaf-Routinen für Zwillinge". A lookup is a binary
+search plus a short forward scan; updates insert or delete single entries.
+"""
+import bisect
+import re
+from typing import Dict, Hashable, List, Tuple
+
+from utils.text_analysis import fold
+
+WORD_START = re.compile(r"\w+")
+
+# (type, label, path) - path is "" for entries that start a new search
+Suggestion = Tuple[str, str, str]
+
+
+def _keys(label: str) -> List[str]:
+    """Folded lookup keys: the whole label and every suffix starting at a word"""
+    folded = fold(label)
+    return [folded[m.start():] for m in WORD_START.finditer(folded)]
+
+
+class SuggestionIndex:
+    """Sorted (key, suggestion) array with reference counts per suggestion"""
+
+    def __init__(self):
+        self._entries: List[Tuple[str, Suggestion]] = []
+        self._refs: Dict[Suggestion, int] = {}
+        self._owned: Dict[Hashable, List[Suggestion]] = {}
+
+    def __len__(self):
+        return len(self._refs)
+
+    def set(self, owner: Hashable, suggestions: List[Suggestion]):
+        """Replace the suggestions contributed by one document"""
+        self.discard(owner)
+        suggestions = list(dict.fromkeys(s for s in suggestions if s[1]))
+        for suggestion in suggestions:
+            count = self._refs.get(suggestion, 0)
+            self._refs[suggestion] = count + 1
+            if count == 0:
+                for key in _keys(suggestion[1]):
+                    bisect.insort(self._entries, (key, suggestion))
+        if suggestions:
+            self._owned[owner] = suggestions
+
+    def discard(self, owner: Hashable):
+        """Drop the suggestions contributed by one document"""
+        for suggestion in self._owned.pop(owner, []):
+            count = self._refs[suggestion] - 1
+            if count:
+                self._refs[suggestion] = count
+                continue
+            del self._refs[suggestion]
+            for key in _keys(suggestion[1]):
+                pos = bisect.bisect_left(self._entries, (key, suggestion))
+                del self._entries[pos]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        """Up to ``limit`` distinct suggestions with a word starting with prefix"""
+        prefix = fold(prefix).strip()
+        if not prefix:
+            return []
+        results: List[dict] = []
+        seen = set()
+        pos = bisect.bisect_left(self._entries, (prefix,))
+        while pos < len(self._entries) and len(results) < limit:
+            key, suggestion = self._entries[pos]
+            if not key.startswith(prefix):
+                break
+            if suggestion not in seen:
+                seen.add(suggestion)
+                kind, label, path = suggestion
+                results.append({"type": kind, "label": label, "path": path or None})
+            pos += 1
+        return results
@@ -0,0 +1,144 @@
+"""German text analysis for the search index
+
+Turns raw text into index terms: Unicode normalization, case folding,
+umlaut folding (ä -> ae, ß -> ss), stop word removal, a light German
+stemmer and optional compound splitting. Documents are analyzed once
+when they are indexed; queries go through the same pipeline.
+"""
+import html
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+WORD_PATTERN = re.compile(r"\w+")
+TAG_PATTERN = re.compile(r"<[^>]*>")
+
+SPLIT_COMPOUNDS = os.environ.get('SEARCH_SPLIT_COMPOUNDS', '1') not in ('0', 'false', 'False')
+
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+STOP_WORDS = frozenset("""
+    aber als am an auch auf aus bei bin bis da das dass dem den der des die
+    doch du ein eine einem einen einer eines er es fuer hat ich ihr im in ist
+    ja mit nach nicht noch nur oder so sie sind um und uns von vom war wie
+    wir zu zum zur
+""".split())
+
+# Consonants after which a final "s" / "st" is an inflection, not part of the stem
+ST_ENDINGS = frozenset("bdfghklmnpt")
+
+# Linking elements ("Fugen") that may join the parts of a compound
+LINKING_ELEMENTS = ("", "s", "es", "n", "en", "er", "e")
+
+MIN_COMPOUND_LENGTH = 8
+MIN_PART_LENGTH = 3
+
+# Words the compound splitter recognises as compound parts, kept to the
+# site's own vocabulary. Stemmed into ``COMPOUND_LEXICON`` below.
+COMPOUND_WORDS = """
+    Abdruck Abdrücke Abend Abenteuer Alltag Arzt Ausflug Auto Baby Bad Bett
+    Bild Brei Eltern Essen Familie Farbe Finger Flasche früh Geburt Geschichte
+    Geschwister Hand Haus Hebamme Hilfe Idee Jahr Kind Klecks Kleid
+    Krankenhaus Kunst Leben Malerei Mama Milch Mittag Monat Mutter Nacht Oma
+    Opa Papa Ratschläge Reise Routine Schlaf schwanger Schwangerschaft Spiel
+    stillen Strand Tag Tandem Tasche Tipp Trick Trimester Ultraschall Urlaub
+    Vater Wagen Wickel Windel Woche Zeit Zwilling
+""".split()
+
+
+def strip_html(text: str) -> str:
+    """Plain text of an HTML fragment with whitespace collapsed"""
+    return " ".join(html.unescape(TAG_PATTERN.sub(" ", text)).split())
+
+
+def fold(text: str) -> str:
+    """Normalize Unicode, case-fold and transliterate umlauts and accents"""
+    text = unicodedata.normalize("NFKC", text).lower().translate(UMLAUTS)
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=50000)
+def stem(word: str) -> str:
+    """Light German stemmer (after Savoy) for already folded words
+
+    Strips inflectional endings only, so "zwillinge", "zwillingen" and
+    "zwillings" all reduce to "zwilling".
+    """
+    n = len(word)
+    # Step 1: plural and case endings
+    if n > 5 and word.endswith("ern"):
+        n -= 3
+    elif n > 4 and word[n - 2] == "e" and word[n - 1] in "mnrs":
+        n -= 2
+    elif n > 3 and word[n - 1] == "e":
+        n -= 1
+    elif n > 3 and word[n - 1] == "s" and word[n - 2] in ST_ENDINGS:
+        n -= 1
+    # Step 2: adjective and verb endings
+    if n > 5 and word[n - 3:n] == "est":
+        n -= 3
+    elif n > 4 and word[n - 2] == "e" and word[n - 1] in "rn":
+        n -= 2
+    elif n > 4 and word[n - 2:n] == "st" and word[n - 3] in ST_ENDINGS:
+        n -= 2
+    return word[:n]
+
+
+COMPOUND_LEXICON = frozenset(stem(fold(word)) for word in COMPOUND_WORDS)
+
+
+@lru_cache(maxsize=50000)
+def split_compound(word: str) -> Tuple[str, ...]:
+    """Split a folded compound into known stems ("zwillingsalltag" -> zwilling, alltag)
+
+    Greedy longest-head match against ``COMPOUND_LEXICON``; the tail may
+    follow a linking element and is split recursively. Returns an empty
+    tuple when the word cannot be decomposed.
+    """
+    if len(word) < MIN_COMPOUND_LENGTH:
+        return ()
+    for cut in range(len(word) - MIN_PART_LENGTH, MIN_PART_LENGTH - 1, -1):
+        head = stem(word[:cut])
+        if head not in COMPOUND_LEXICON:
+            continue
+        for link in LINKING_ELEMENTS:
+            if not word.startswith(link, cut):
+                continue
+            tail = word[cut + len(link):]
+            if len(tail) < MIN_PART_LENGTH + 1:
+                continue
+            tail_stem = stem(tail)
+            if tail_stem in COMPOUND_LEXICON:
+                return (head, tail_stem)
+            rest = split_compound(tail)
+            if rest:
+                return (head, *rest)
+    return ()
+
+
+def analyze_spans(text: str, split_compounds: bool = False) -> Iterator[Tuple[str, int, int]]:
+    """Yield (term, start, end) for every index term in the text
+
+    Offsets point into the NFKC-normalized text. Compound parts are yielded
+    in addition to the whole word and share its span.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    for match in WORD_PATTERN.finditer(text):
+        word = fold(match.group())
+        if len(word) < 2 or word in STOP_WORDS:
+            continue
+        start, end = match.span()
+        yield stem(word), start, end
+        if split_compounds:
+            for part in split_compound(word):
+                yield part, start, end
+
+
+def analyze(text: str, split_compounds: bool = False) -> List[str]:
+    """Return the index terms of a text"""
+    return [term for term, _, _ in analyze_spans(text, split_compounds)]
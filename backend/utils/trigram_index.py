@@ -0,0 +1,97 @@
+"""Character-trigram index for typo-tolerant search
+
+Holds the vocabulary of titles, tags and headings. A misspelled query term
+is matched by collecting indexed terms that share enough trigrams with it
+(candidate generation) and verifying each with a bounded edit distance,
+so no pass over the whole vocabulary is needed.
+"""
+from typing import Dict, Iterable, List, Set
+
+
+def trigrams(term: str) -> Set[str]:
+    """Padded character trigrams of a term ("baby" -> "  b", " ba", "bab", ...)"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(term: str) -> int:
+    """Edit distance tolerated for a query term of this length"""
+    if len(term) < 4:
+        return 0
+    if len(term) < 8:
+        return 1
+    return 2
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class TrigramIndex:
+    """Trigram -> terms postings with reference counts per term"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._refs: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._refs)
+
+    def add(self, terms: Iterable[str]):
+        for term in terms:
+            count = self._refs.get(term, 0)
+            self._refs[term] = count + 1
+            if count == 0:
+                for gram in trigrams(term):
+                    self._postings.setdefault(gram, set()).add(term)
+
+    def remove(self, terms: Iterable[str]):
+        for term in terms:
+            count = self._refs.get(term, 0) - 1
+            if count > 0:
+                self._refs[term] = count
+                continue
+            self._refs.pop(term, None)
+            for gram in trigrams(term):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(term)
+                    if not postings:
+                        del self._postings[gram]
+
+    def similar(self, term: str) -> List[str]:
+        """Indexed terms within ``max_edits(term)`` edits of term"""
+        limit = max_edits(term)
+        if limit == 0:
+            return []
+        grams = trigrams(term)
+        # Every edit touches at most three trigrams
+        min_shared = len(grams) - 3 * limit
+        if min_shared < 1:
+            return []
+
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        return [
+            candidate for candidate, count in shared.items()
+            if count >= min_shared
+            and bounded_levenshtein(term, candidate, limit) <= limit
+        ]
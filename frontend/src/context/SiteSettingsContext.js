@@ -1,4 +1,4 @@
-import { createContext, useContext, useState, useEffect } from 'react';
+import { createContext, useContext, useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
 
 const SiteSettingsContext = createContext();
@@ -20,16 +20,7 @@ export function SiteSettingsProvider({ children }) {
   const [settings, setSettings] = useState(defaultSettings);
   const [loading, setLoading] = useState(true);
 
-  useEffect(() => {
-    fetchSettings();
-  }, []);
-
-  useEffect(() => {
-    // Apply font family
-    document.documentElement.style.setProperty('--font-family', settings.fontFamily);
-  }, [settings.fontFamily]);
-
-  const fetchSettings = async () => {
+  const fetchSettings = useCallback(async () => {
     try {
       const response = await axios.get(`${API}/settings`);
       if (response.data) {
@@ -40,7 +31,26 @@ export function SiteSettingsProvider({ children }) {
     } finally {
       setLoading(false);
     }
-  };
+  }, []);
+
+  useEffect(() => {
+    // The home page loads settings with its /home bundle
+    if (window.location.pathname !== '/') {
+      fetchSettings();
+    }
+  }, [fetchSettings]);
+
+  useEffect(() => {
+    // Apply font family
+    document.documentElement.style.setProperty('--font-family', settings.fontFamily);
+  }, [settings.fontFamily]);
+
+  const applySettings = useCallback((data) => {
+    if (data) {
+      setSettings({ ...defaultSettings, ...data });
+    }
+    setLoading(false);
+  }, []);
 
   const updateSettings = async (newSettings) => {
     try {
@@ -55,7 +65,7 @@ export function SiteSettingsProvider({ children }) {
   };
 
   return (
-    <SiteSettingsContext.Provider value={{ settings, updateSettings, loading, refetch: fetchSettings }}>
+    <SiteSettingsContext.Provider value={{ settings, updateSettings, loading, refetch: fetchSettings, applySettings }}>
       {children}
     </SiteSettingsContext.Provider>
   );
@@ -57,6 +57,17 @@ import {
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 
+// Load every page of a cursor-paginated list (X-Next-Cursor header)
+const fetchAllPages = async (url) => {
+  let res = await axios.get(url);
+  const items = [...res.data];
+  while (res.headers['x-next-cursor']) {
+    res = await axios.get(`${url}&cursor=${encodeURIComponent(res.headers['x-next-cursor'])}`);
+    items.push(...res.data);
+  }
+  return { data: items };
+};
+
 const CATEGORIES = ['Schlaf', 'Füttern', 'Tipps', 'Alltag', 'Gesundheit', 'Reisen'];
 
 const SOCIAL_PLATFORMS = [
@@ -106,7 +117,7 @@ export default function Admin() {
   const [saveStatus, setSaveStatus] = useState('');
   
   // Data states
-  const [stats, setStats] = useState({ total_contacts: 0, unread_contacts: 0, total_pages: 0, total_gallery: 0, total_posts: 0, donations_count: 0 });
+  const [stats, setStats] = useState({ total_contacts: 0, unread_contacts: 0, total_pages: 0, total_gallery: 0, total_posts: 0, donations_count: 0, admin_sessions: 0 });
   const [pages, setPages] = useState([]);
   const [trashedPages, setTrashedPages] = useState([]);
   const [gallery, setGallery] = useState([]);
@@ -230,10 +241,10 @@ export default function Admin() {
     try {
       const [statsRes, pagesRes, galleryRes, contactsRes, postsRes, settingsRes, newsRes, impressumRes, datenschutzRes, cookiesRes, staticPagesRes, landingRes] = await Promise.all([
         axios.get(`${API}/admin/stats?token=${t}`),
-        axios.get(`${API}/admin/pages?token=${t}`),
+        fetchAllPages(`${API}/admin/pages?token=${t}`),
         axios.get(`${API}/admin/gallery?token=${t}`),
-        axios.get(`${API}/admin/contacts?token=${t}`),
-        axios.get(`${API}/admin/posts?token=${t}`),
+        fetchAllPages(`${API}/admin/contacts?token=${t}`),
+        fetchAllPages(`${API}/admin/posts?token=${t}`),
         axios.get(`${API}/settings`),
         axios.get(`${API}/admin/news?token=${t}`),
         axios.get(`${API}/admin/page-content/impressum?token=${t}`).catch(() => ({ data: null })),
@@ -800,12 +811,13 @@ export default function Admin() {
                 <motion.div key="dashboard" initial={{ opacity: 0 }} animate={{ opacity: 1 }} exit={{ opacity: 0 }} className="space-y-6">
                   <h1 className="text-2xl font-semibold">Dashboard</h1>
                   
-                  <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
+                  <div className="grid grid-cols-2 lg:grid-cols-5 gap-4">
                     {[
                       { label: 'Kontakte', value: stats.total_contacts, sub: `${stats.unread_contacts} ungelesen`, icon: Mail },
                       { label: 'Seiten', value: pages.length, sub: `${trashedPages.length} im Papierkorb`, icon: FileText },
                       { label: 'Galerie', value: stats.total_gallery, icon: Image },
                       { label: 'Blog', value: posts.length, sub: `${trashedPosts.length} im Papierkorb`, icon: Layers },
+                      { label: 'Sitzungen', value: stats.admin_sessions, sub: 'gespeicherte Admin-Sitzungen', icon: Shield },
                     ].map((stat) => (
                       <div key={stat.label} className="p-4 rounded-xl border border-border bg-card">
                         <div className="flex items-center justify-between mb-2">
@@ -20,7 +20,7 @@ export default function Blog() {
   useEffect(() => {
     const fetchPosts = async () => {
       try {
-        const res = await axios.get(`${API}/blog`);
+        const res = await axios.get(`${API}/blog?view=summary`);
         setPosts(res.data);
         setFilteredPosts(res.data);
       } catch (error) {
@@ -25,31 +25,25 @@ export default function Home() {
   const [currentNewsIndex, setCurrentNewsIndex] = useState(0);
   const [currentGalleryIndex, setCurrentGalleryIndex] = useState(0);
   const { theme } = useTheme();
-  const { settings } = useSiteSettings();
+  const { settings, applySettings, refetch: refetchSettings } = useSiteSettings();
 
-  // Fetch data
+  // Fetch data: one bundle with settings, landing content, blog, news and gallery
   useEffect(() => {
     const fetchData = async () => {
       try {
-        await axios.post(`${API}/seed`);
-        const [blogRes, newsRes, landingRes, galleryRes] = await Promise.all([
-          axios.get(`${API}/blog?limit=4`),
-          axios.get(`${API}/news`),
-          axios.get(`${API}/landing-content`).catch(() => ({ data: null })),
-          axios.get(`${API}/gallery`).catch(() => ({ data: [] }))
-        ]);
-        setBlogPosts(blogRes.data);
-        setNewsItems(newsRes.data);
-        setGalleryImages(galleryRes.data || []);
-        if (landingRes.data) {
-          setLandingContent(landingRes.data);
-        }
+        const { data } = await axios.get(`${API}/home`);
+        applySettings(data.settings);
+        setLandingContent(data.landing);
+        setBlogPosts(data.blog || []);
+        setNewsItems(data.news || []);
+        setGalleryImages(data.gallery || []);
       } catch (error) {
         console.error('Error fetching data:', error);
+        refetchSettings();
       }
     };
     fetchData();
-  }, []);
+  }, [applySettings, refetchSettings]);
 
   // News carousel auto-advance
   useEffect(() => {
@@ -8,11 +8,45 @@ import { PageHero } from '../components/PageBackground';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 
+// Renders a search snippet with its [start, end] highlight ranges marked
+function Highlighted({ text, ranges }) {
+  if (!text) return null;
+  const parts = [];
+  let last = 0;
+  (ranges || []).forEach(([start, end], i) => {
+    if (start > last) parts.push(text.slice(last, start));
+    parts.push(<mark key={i} className="bg-primary/20 text-foreground rounded px-0.5">{text.slice(start, end)}</mark>);
+    last = end;
+  });
+  parts.push(text.slice(last));
+  return <>{parts}</>;
+}
+
 export default function Suchen() {
   const [query, setQuery] = useState('');
   const [results, setResults] = useState({ pages: [], posts: [], gallery: [], static_pages: [] });
   const [loading, setLoading] = useState(false);
   const [hasSearched, setHasSearched] = useState(false);
+  const [suggestions, setSuggestions] = useState([]);
+
+  useEffect(() => {
+    const prefix = query.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+
+    const timer = setTimeout(async () => {
+      try {
+        const res = await axios.get(`${API}/search/suggest?q=${encodeURIComponent(prefix)}`);
+        setSuggestions(res.data.suggestions.filter((s) => s.label.toLowerCase() !== prefix.toLowerCase()));
+      } catch (error) {
+        setSuggestions([]);
+      }
+    }, 100);
+
+    return () => clearTimeout(timer);
+  }, [query]);
 
   useEffect(() => {
     if (!query.trim() || query.trim().length < 2) {
@@ -25,7 +59,7 @@ export default function Suchen() {
       setLoading(true);
       setHasSearched(true);
       try {
-        const res = await axios.get(`${API}/search?q=${encodeURIComponent(query.trim())}`);
+        const res = await axios.get(`${API}/search?q=${encodeURIComponent(query.trim())}&fuzzy=true`);
         setResults(res.data);
       } catch (error) {
         console.error('Search error:', error);
@@ -69,6 +103,29 @@ export default function Suchen() {
             </button>
           )}
         </div>
+        {suggestions.length > 0 && (
+          <div className="mt-3 max-w-xl flex flex-wrap gap-2" data-testid="search-suggestions">
+            {suggestions.map((s) => (
+              s.path ? (
+                <Link
+                  key={`${s.type}-${s.label}`}
+                  to={s.path}
+                  className="px-3 py-1 rounded-full border border-border text-sm hover:bg-secondary/50 transition-colors"
+                >
+                  {s.label}
+                </Link>
+              ) : (
+                <button
+                  key={`${s.type}-${s.label}`}
+                  onClick={() => setQuery(s.label)}
+                  className="px-3 py-1 rounded-full border border-border text-sm text-muted-foreground hover:bg-secondary/50 transition-colors"
+                >
+                  {s.label}
+                </button>
+              )
+            ))}
+          </div>
+        )}
       </PageHero>
             
       {/* Results Section */}
@@ -112,7 +169,9 @@ export default function Suchen() {
                         className="p-5 rounded-xl border border-border hover:bg-secondary/50 hover:border-primary/30 transition-all group"
                       >
                         <h3 className="font-semibold text-foreground group-hover:text-primary mb-1">{page.title}</h3>
-                        <p className="text-sm text-muted-foreground line-clamp-2">{page.description}</p>
+                        <p className="text-sm text-muted-foreground line-clamp-2">
+                          <Highlighted text={page.snippet || page.description} ranges={page.snippet ? page.highlights : []} />
+                        </p>
                         <span className="text-xs text-primary mt-2 inline-block">{page.path}</span>
                       </Link>
                     ))}
@@ -130,11 +189,14 @@ export default function Suchen() {
                     {results.pages.map((page) => (
                       <Link
                         key={page.id}
-                        to={`/${page.slug}`}
+                        to={page.path}
                         className="p-4 rounded-xl border border-border hover:bg-secondary/50 transition-colors group"
                       >
                         <h3 className="font-semibold text-foreground group-hover:text-primary">{page.title}</h3>
-                        <p className="text-sm text-muted-foreground">/{page.slug}</p>
+                        <p className="text-sm text-muted-foreground line-clamp-2">
+                          <Highlighted text={page.snippet} ranges={page.highlights} />
+                        </p>
+                        <p className="text-xs text-primary mt-1">{page.path}</p>
                       </Link>
                     ))}
                   </div>
@@ -151,7 +213,7 @@ export default function Suchen() {
                     {results.posts.map((post) => (
                       <Link
                         key={post.id}
-                        to={`/blog/${post.id}`}
+                        to={post.path}
                         className="group"
                       >
                         {post.image_url && (
@@ -161,7 +223,9 @@ export default function Suchen() {
                         )}
                         <span className="text-xs text-primary font-medium">{post.category}</span>
                         <h3 className="font-semibold text-foreground group-hover:text-primary">{post.title}</h3>
-                        <p className="text-sm text-muted-foreground line-clamp-2">{post.excerpt}</p>
+                        <p className="text-sm text-muted-foreground line-clamp-3">
+                          <Highlighted text={post.snippet} ranges={post.highlights} />
+                        </p>
                       </Link>
                     ))}
                   </div>
@@ -178,7 +242,7 @@ export default function Suchen() {
                     {results.gallery.map((img) => (
                       <Link
                         key={img.id}
-                        to="/twins-art"
+                        to={img.path}
                         className="aspect-square rounded-xl overflow-hidden group"
                       >
                         <img src={img.url} alt={img.title} className="w-full h-full object-cover group-hover:scale-105 transition-transform" />
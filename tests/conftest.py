@@ -0,0 +1,4 @@
+import os
+
+# Unit tests never reach MongoDB; set before ``database`` is imported
+os.environ.setdefault("REPOSITORY_BACKEND", "memory")
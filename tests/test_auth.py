@@ -0,0 +1,39 @@
+import pytest
+
+from utils.auth import SignedSessionState
+
+
+@pytest.fixture
+def state():
+    state = SignedSessionState()
+    state.secret = b"test-secret"
+    return state
+
+
+def test_parse_accepts_a_signed_token(state):
+    token = f"1700000000000.abc.{state.sign('1700000000000.abc')}"
+    assert state.parse(token) == (1700000000000, "abc")
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "1.abc",
+    "1.abc.sig.extra",
+    "1.abc.not-the-signature",
+    # Non-ASCII signatures made hmac.compare_digest raise TypeError
+    "1.abc.süß",
+    # Superscript digits pass str.isdigit() but not int()
+    "²³.abc.sig",
+])
+def test_parse_rejects_malformed_tokens(state, token):
+    assert state.parse(token) is None
+
+
+def test_parse_rejects_tokens_signed_for_another_id(state):
+    assert state.parse(f"1.abc.{state.sign('1.xyz')}") is None
+
+
+def test_parse_without_secret(state):
+    token = f"1.abc.{state.sign('1.abc')}"
+    state.secret = b""
+    assert state.parse(token) is None
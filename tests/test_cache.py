@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from utils.cache import LRUCache, ResponseCache, SingleFlight
+from utils.circuit_breaker import DatabaseUnavailable
+
+
+class Loader:
+    """Counts calls; each call returns the next value or raises it"""
+
+    def __init__(self, *results, delay: float = 0):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        result = self.results[min(self.calls, len(self.results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=0)
+    assert (cache.get("a"), cache.get("b", "gone")) == (1, "gone")
+    assert cache.stats()["hits"] == 1
+
+
+def test_response_cache_invalidates_by_key():
+    cache = ResponseCache()
+    assert cache.put(("settings",), {"title": "Zwillinge"}) == b'{"title":"Zwillinge"}'
+    cache.invalidate(("settings",), ("unknown",))
+    assert cache.get(("settings",)) is None
+
+
+def test_concurrent_reads_share_one_load():
+    flight = SingleFlight()
+    load = Loader("value", delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*[flight.get("key", load, version=1) for _ in range(20)])
+
+    assert asyncio.run(run()) == ["value"] * 20
+    assert load.calls == 1
+
+
+def test_version_change_waits_for_the_new_value():
+    flight = SingleFlight()
+
+    async def run():
+        await flight.get("key", Loader("old"), version=1)
+        return await flight.get("key", Loader("new"), version=2)
+
+    assert asyncio.run(run()) == "new"
+
+
+def test_version_change_does_not_join_an_older_load():
+    flight = SingleFlight()
+
+    async def run():
+        before = asyncio.ensure_future(flight.get("key", Loader("old", delay=0.02), version=1))
+        await asyncio.sleep(0)
+        after = await flight.get("key", Loader("new"), version=2)
+        return await before, after
+
+    assert asyncio.run(run()) == ("old", "new")
+
+
+def test_expired_value_is_reloaded():
+    flight = SingleFlight(ttl_for=lambda value: 0 if value == "first" else None)
+    load = Loader("first", "second")
+
+    async def run():
+        first = await flight.get("key", load, version=1)
+        return first, await flight.get("key", load, version=1), await flight.get("key", load, version=1)
+
+    assert asyncio.run(run()) == ("first", "second", "second")
+    assert load.calls == 2
+
+
+def test_other_errors_drop_the_value():
+    flight = SingleFlight(ttl=0)
+
+    async def run():
+        await flight.get("key", Loader("good"), version=1)
+        with pytest.raises(LookupError):
+            await flight.get("key", Loader(LookupError("gone")), version=1)
+        # Nothing left to fall back on
+        await flight.get("key", Loader(DatabaseUnavailable("down")), version=1)
+
+    with pytest.raises(DatabaseUnavailable):
+        asyncio.run(run())
+
+
+def test_outage_falls_back_to_the_current_value():
+    flight = SingleFlight(ttl=0)
+
+    async def run():
+        await flight.get("key", Loader("good"), version=1)
+        return await flight.get("key", Loader(DatabaseUnavailable("down")), version=1)
+
+    assert asyncio.run(run()) == "good"
+
+
+def test_outage_after_a_write_does_not_serve_the_old_value():
+    flight = SingleFlight()
+
+    async def run():
+        await flight.get("key", Loader("deleted post"), version=1)
+        await flight.get("key", Loader(DatabaseUnavailable("down")), version=2)
+
+    with pytest.raises(DatabaseUnavailable):
+        asyncio.run(run())
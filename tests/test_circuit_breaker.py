@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from utils.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+
+
+async def _down():
+    raise ServerSelectionTimeoutError("no primary")
+
+
+async def _ok():
+    return "ok"
+
+
+async def _slow():
+    await asyncio.sleep(1)
+
+
+async def _missing():
+    raise LookupError("404")
+
+
+def _call(breaker: CircuitBreaker, loader):
+    return asyncio.run(breaker.call(loader))
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test", threshold=2, reset_seconds=60)
+    for _ in range(2):
+        with pytest.raises(DatabaseUnavailable):
+            _call(breaker, _down)
+    assert breaker.state == "open"
+    with pytest.raises(DatabaseUnavailable):
+        _call(breaker, _ok)
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_closes_the_breaker():
+    breaker = CircuitBreaker("test", threshold=1, reset_seconds=0)
+    with pytest.raises(DatabaseUnavailable):
+        _call(breaker, _down)
+    assert breaker.state == "open"
+    assert _call(breaker, _ok) == "ok"
+    assert (breaker.state, breaker.failures) == ("closed", 0)
+
+
+def test_failed_probe_opens_again():
+    breaker = CircuitBreaker("test", threshold=5, reset_seconds=0)
+    breaker.state = "open"
+    with pytest.raises(DatabaseUnavailable):
+        _call(breaker, _down)
+    assert breaker.state == "open"
+
+
+def test_deadline_counts_as_failure():
+    breaker = CircuitBreaker("test", threshold=1, timeout_ms=10)
+    with pytest.raises(DatabaseUnavailable):
+        _call(breaker, _slow)
+    assert (breaker.state, breaker.timeouts) == ("open", 1)
+
+
+def test_answers_other_than_outages_pass_through():
+    breaker = CircuitBreaker("test", threshold=1)
+    with pytest.raises(LookupError):
+        _call(breaker, _missing)
+    assert breaker.state == "closed"
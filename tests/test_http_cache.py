@@ -0,0 +1,22 @@
+import pytest
+
+from utils.http_cache import accepts_gzip
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, gzip;q=0.8", True),
+    ("*", True),
+    ("GZIP", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000, deflate", False),
+    ("*;q=0", False),
+    ("gzip;q=0.5, *;q=0", True),
+    ("*, gzip;q=0", False),
+    ("deflate, br", False),
+    ("identity", False),
+    ("", False),
+    (None, False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
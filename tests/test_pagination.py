@@ -0,0 +1,76 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from repository import InMemoryRepository, matches
+from utils.pagination import decode_cursor, encode_cursor, fetch_page, keyset_filter
+
+SORT = [("created_at", -1), ("id", 1)]
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def test_keyset_filter_descending_key_with_tiebreaker():
+    assert keyset_filter(SORT, [START, "b"]) == {"$or": [
+        {"$or": [{"created_at": {"$lt": START}}, {"created_at": None}]},
+        {"$and": [{"created_at": START}, {"id": {"$gt": "b"}}]},
+    ]}
+
+
+def test_keyset_filter_null_sorts_first():
+    after_null = keyset_filter([("order", 1), ("id", 1)], [None, "b"])
+    assert matches({"order": 1, "id": "a"}, after_null)
+    assert matches({"order": None, "id": "c"}, after_null)
+    assert not matches({"order": None, "id": "a"}, after_null)
+    # Descending: nothing sorts after null except its own ties
+    assert keyset_filter(SORT, [None, "b"]) == {"$or": [
+        {"$and": [{"created_at": None}, {"id": {"$gt": "b"}}]},
+    ]}
+
+
+def test_cursor_round_trip_keeps_aware_datetimes():
+    values = [START.replace(microsecond=123000), "id-1"]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    _raw_cursor(["only one"]),
+    _raw_cursor({"created_at": 1}),
+    _raw_cursor([{"$gt": ""}, "x"]),
+    _raw_cursor([["nested"], "x"]),
+])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_fetch_page_walks_the_whole_list():
+    collection = InMemoryRepository().posts
+    docs = [
+        # Microseconds are truncated on insert; ties and nulls on the sort key
+        {"id": f"p{i:02d}", "created_at": START + timedelta(microseconds=(i // 3) * 1500) if i % 7 else None}
+        for i in range(25)
+    ]
+
+    async def walk():
+        await collection.insert_many(docs)
+        expected = await collection.find({}, {"_id": 0}).sort(SORT).to_list(None)
+        seen, cursor = [], None
+        while True:
+            page, cursor = await fetch_page(collection, {}, SORT, 4, cursor)
+            seen.extend(page)
+            if cursor is None:
+                return seen, expected
+
+    seen, expected = asyncio.run(walk())
+    assert [doc["id"] for doc in seen] == [doc["id"] for doc in expected]
+    assert len(seen) == 25
@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from publish import SnapshotPublisher
+
+
+def _publisher(calls: list) -> SnapshotPublisher:
+    publisher = SnapshotPublisher("unused")
+    publisher.schedule = lambda scopes=(): calls.append(scopes)
+    return publisher
+
+
+def test_republishes_when_the_next_news_change_passes():
+    calls = []
+
+    async def run():
+        publisher = _publisher(calls)
+        publisher._schedule_at(datetime.now(timezone.utc) + timedelta(milliseconds=20))
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert calls == [()]
+
+
+def test_a_new_export_replaces_the_pending_timer():
+    calls = []
+
+    async def run():
+        publisher = _publisher(calls)
+        publisher._schedule_at(datetime.now(timezone.utc) + timedelta(milliseconds=20))
+        publisher._schedule_at(None)
+        await asyncio.sleep(0.1)
+        return publisher._timer
+
+    assert asyncio.run(run()) is None
+    assert calls == []
@@ -0,0 +1,30 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from repository import InMemoryRepository, _to_bson
+
+
+def test_to_bson_stores_naive_datetimes_as_utc():
+    stored = _to_bson({"dates": [datetime(2025, 1, 1, 12, 0, 0, 123456)]})
+    assert stored == {"dates": [datetime(2025, 1, 1, 12, 0, 0, 123000, tzinfo=timezone.utc)]}
+
+
+def test_to_bson_keeps_aware_datetimes():
+    local = timezone(timedelta(hours=2))
+    stored = _to_bson(datetime(2025, 1, 1, 12, tzinfo=local))
+    assert stored == datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+
+
+def test_naive_and_aware_dates_compare_as_utc():
+    collection = InMemoryRepository().posts
+
+    async def run():
+        await collection.insert_many([
+            {"id": "naive", "publish_date": datetime(2025, 1, 2)},
+            {"id": "aware", "publish_date": datetime(2025, 1, 1, tzinfo=timezone.utc)},
+        ])
+        ordered = await collection.find({}, {"_id": 0}).sort("publish_date", -1).to_list(None)
+        before = await collection.count_documents({"publish_date": {"$lt": datetime(2025, 1, 1, 12)}})
+        return [doc["id"] for doc in ordered], before
+
+    assert asyncio.run(run()) == (["naive", "aware"], 1)
@@ -0,0 +1,93 @@
+from utils.search_index import IndexedDocument, SearchIndex
+
+
+def _doc(doc_id: str, title: str, content: str = "", tags: str = "") -> IndexedDocument:
+    return IndexedDocument(
+        fields={"title": title, "tags": tags, "content": content},
+        result={"id": doc_id, "title": title},
+        suggestions=[("post", title, f"/blog/{doc_id}")],
+        snippet_text=content,
+    )
+
+
+def _ids(results: dict, kind: str = "posts") -> list:
+    return [hit["id"] for hit in results[kind]]
+
+
+def _index(*docs: IndexedDocument) -> SearchIndex:
+    index = SearchIndex()
+    for doc in docs:
+        index.add("posts", doc.result["id"], doc)
+    return index
+
+
+def test_every_query_token_must_match():
+    index = _index(
+        _doc("both", "Schlaf und Routine"),
+        _doc("one", "Schlaf im Urlaub"),
+    )
+    assert _ids(index.search("schlaf routine")) == ["both"]
+    assert index.search("schlaf routine")["total"]["posts"] == 1
+
+
+def test_query_tokens_match_as_prefixes():
+    index = _index(_doc("p1", "Zwillinge im Urlaub"))
+    assert _ids(index.search("zwil")) == ["p1"]
+    assert _ids(index.search("urlau")) == ["p1"]
+
+
+def test_remove_and_reindex():
+    index = _index(_doc("p1", "Zwillinge"), _doc("p2", "Zwillinge"))
+    index.remove("posts", "p1")
+    assert _ids(index.search("zwillinge")) == ["p2"]
+    index.add("posts", "p2", _doc("p2", "Babybrei"))
+    assert index.search("zwillinge")["total"]["posts"] == 0
+    assert _ids(index.search("babybrei")) == ["p2"]
+    assert len(index) == 1
+
+
+def test_title_hits_outrank_body_hits():
+    index = _index(
+        _doc("body", "Unser Urlaub", "Mit Zwillingen am Strand"),
+        _doc("title", "Zwillinge am Strand", "Ein Tag am Meer"),
+    )
+    assert _ids(index.search("zwillinge")) == ["title", "body"]
+
+
+def test_top_k_with_limit_and_offset():
+    index = _index(*[_doc(f"p{i}", "Zwillinge " + "Tipp " * i) for i in range(5)])
+    first = index.search("zwillinge", limit=2)
+    second = index.search("zwillinge", limit=2, offset=2)
+    everything = index.search("zwillinge", limit=10)
+    assert first["total"]["posts"] == 5
+    assert len(first["posts"]) == 2
+    # Shorter titles weigh the match more
+    assert _ids(everything) == ["p0", "p1", "p2", "p3", "p4"]
+    assert _ids(first) + _ids(second) == _ids(everything)[:4]
+
+
+def test_inflections_and_compound_parts_match():
+    index = _index(_doc("p1", "Unser Zwillingsalltag mit Kindern"))
+    assert _ids(index.search("alltag")) == ["p1"]
+    assert _ids(index.search("Kind")) == ["p1"]
+
+
+def test_fuzzy_matches_misspelled_title_words():
+    index = _index(_doc("p1", "Schlafroutine"))
+    assert _ids(index.search("schlafrutine")) == []
+    assert _ids(index.search("schlafrutine", fuzzy=True)) == ["p1"]
+
+
+def test_suggestions_follow_reindex():
+    index = _index(_doc("p1", "Zwillinge im Urlaub"))
+    index.add("posts", "p1", _doc("p1", "Babybrei"))
+    assert index.suggest("zwil") == []
+    assert [s["label"] for s in index.suggest("baby")] == ["Babybrei"]
+
+
+def test_snippet_highlights_matched_terms():
+    index = _index(_doc("p1", "Ausflug", "Ein Ausflug mit den Zwillingen an den Strand"))
+    hit = index.search("strand")["posts"][0]
+    assert set(hit) == {"id", "title", "snippet", "highlights"}
+    start, end = hit["highlights"][0]
+    assert hit["snippet"][start:end] == "Strand"
@@ -0,0 +1,31 @@
+from utils.search_index import _static_page_document, static_search_document
+
+
+def test_null_fields_count_as_empty():
+    document = static_search_document({
+        "page_id": "custom",
+        "title": None,
+        "hero_title": None,
+        "hero_description": None,
+        "sections": [
+            {"title": "Schlaf", "description": None, "subtitle": 3, "items": [None, "Ruhe", {"title": None}]},
+            None,
+            {"items": None},
+        ],
+    })
+    assert document["title"] == ""
+    assert document["path"] == "/custom"
+    assert document["fields"] == {"title": "", "tags": "Schlaf", "excerpt": "", "content": "Ruhe"}
+
+
+def test_null_sections():
+    document = static_search_document({"page_id": "custom", "title": "Tipps", "sections": None})
+    assert document["title"] == "Tipps"
+    assert document["fields"]["content"] == ""
+
+
+def test_defaults_fill_missing_fields():
+    document = static_search_document({"page_id": "tipps", "sections": [{"title": "Schlaf"}]})
+    indexed = _static_page_document({"page_id": "tipps", "search_document": document})
+    assert indexed.result["path"] == "/tipps"
+    assert "Schlaf" in indexed.fields["tags"]
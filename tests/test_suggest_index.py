@@ -0,0 +1,42 @@
+from utils.suggest_index import SuggestionIndex
+
+POST = ("post", "Schlaf-Routinen für Zwillinge", "/blog/1")
+TAG = ("tag", "Routine", "")
+
+
+def test_suggest_matches_every_word_start():
+    index = SuggestionIndex()
+    index.set("post-1", [POST])
+    assert index.suggest("schlaf") == [{"type": "post", "label": POST[1], "path": "/blog/1"}]
+    assert index.suggest("zwil") == [{"type": "post", "label": POST[1], "path": "/blog/1"}]
+    assert index.suggest("fuer") == [{"type": "post", "label": POST[1], "path": "/blog/1"}]
+    assert index.suggest("lling") == []
+
+
+def test_suggest_is_sorted_distinct_and_limited():
+    index = SuggestionIndex()
+    index.set("post-1", [POST])
+    index.set("image-1", [TAG])
+    index.set("image-2", [TAG])
+    assert [s["label"] for s in index.suggest("rout")] == ["Routine", POST[1]]
+    assert len(index.suggest("rout", limit=1)) == 1
+    assert index.suggest("  ") == []
+
+
+def test_shared_suggestions_stay_until_the_last_owner_is_gone():
+    index = SuggestionIndex()
+    index.set("image-1", [TAG])
+    index.set("image-2", [TAG])
+    index.discard("image-1")
+    assert [s["label"] for s in index.suggest("rout")] == ["Routine"]
+    index.discard("image-2")
+    assert index.suggest("rout") == []
+    assert len(index) == 0
+
+
+def test_set_replaces_the_owners_suggestions():
+    index = SuggestionIndex()
+    index.set("post-1", [POST])
+    index.set("post-1", [("post", "Windeltasche packen", "/blog/1")])
+    assert index.suggest("schlaf") == []
+    assert [s["label"] for s in index.suggest("wind")] == ["Windeltasche packen"]
@@ -0,0 +1,40 @@
+from utils.text_analysis import analyze, analyze_spans, fold, split_compound, stem, strip_html
+
+
+def test_fold_transliterates_umlauts_and_accents():
+    assert fold("Größe") == "groesse"
+    assert fold("Café") == "cafe"
+    assert fold("ÜBER") == "ueber"
+
+
+def test_stem_reduces_inflections_to_one_stem():
+    assert stem("zwillinge") == stem("zwillingen") == stem("zwillings") == "zwilling"
+
+
+def test_split_compound_into_lexicon_stems():
+    assert split_compound("zwillingsalltag") == ("zwilling", "alltag")
+    assert split_compound("windeltasche") == ("windel", "tasch")
+
+
+def test_split_compound_leaves_short_and_unknown_words():
+    assert split_compound("haus") == ()
+    assert split_compound("donaudampfschiff") == ()
+
+
+def test_analyze_drops_stop_words_and_adds_compound_parts():
+    assert analyze("Der Zwillingsalltag und die Kinder", split_compounds=True) == [
+        "zwillingsalltag", "zwilling", "alltag", "kind",
+    ]
+    assert analyze("Der Zwillingsalltag", split_compounds=False) == ["zwillingsalltag"]
+
+
+def test_analyze_spans_point_into_the_text():
+    text = "Tipps für Zwillinge"
+    spans = list(analyze_spans(text))
+    assert [(term, text[start:end]) for term, start, end in spans] == [
+        ("tipp", "Tipps"), ("zwilling", "Zwillinge"),
+    ]
+
+
+def test_strip_html():
+    assert strip_html("<p>Mama &amp;\n<b>Papa</b></p>") == "Mama & Papa"
@@ -0,0 +1,34 @@
+from utils.trigram_index import TrigramIndex, bounded_levenshtein, max_edits, trigrams
+
+
+def test_trigrams_are_padded():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_max_edits_grows_with_term_length():
+    assert [max_edits(term) for term in ("abc", "abcd", "abcdefgh")] == [0, 1, 2]
+
+
+def test_bounded_levenshtein_stops_at_limit():
+    assert bounded_levenshtein("kitten", "sitting", 5) == 3
+    assert bounded_levenshtein("kitten", "sitting", 2) == 3
+    assert bounded_levenshtein("a", "abcdef", 2) == 3
+
+
+def test_similar_finds_terms_within_edit_distance():
+    index = TrigramIndex()
+    index.add(["zwilling", "schlaf", "routin"])
+    assert index.similar("zwiling") == ["zwilling"]
+    assert index.similar("schlf") == ["schlaf"]
+    assert index.similar("abc") == []
+
+
+def test_remove_keeps_terms_with_remaining_references():
+    index = TrigramIndex()
+    index.add(["zwilling"])
+    index.add(["zwilling"])
+    index.remove(["zwilling"])
+    assert index.similar("zwiling") == ["zwilling"]
+    index.remove(["zwilling"])
+    assert index.similar("zwiling") == []
+    assert len(index) == 0